@@ -0,0 +1,52 @@
+namespace tp2;
+
+/// <summary>
+/// Writes the grid of each step with one bit per cell instead of as text. See file_format.txt for the layout.
+/// </summary>
+public class PackedGridWriter : IDisposable
+{
+    public String Filename { get; }
+
+    private readonly BinaryWriter stream;
+    private readonly byte[] buffer;
+
+    public PackedGridWriter(string filename, int width, int height, float probability)
+    {
+        Filename = filename;
+        stream = new BinaryWriter(new FileStream(filename, FileMode.Create, FileAccess.Write, FileShare.Read));
+        buffer = new byte[(width * height + 7) / 8];
+
+        stream.Write(width);
+        stream.Write(height);
+        stream.Write(probability);
+    }
+
+    /// <summary>
+    /// Saves a step's grid. Cells go row by row like in the text output, the first one in the most significant bit
+    /// of the first byte, with 1 for +1 and 0 for -1.
+    /// </summary>
+    public void Save(uint step, sbyte[,] grid)
+    {
+        int width = grid.GetLength(0);
+        int height = grid.GetLength(1);
+        if ((width * height + 7) / 8 != buffer.Length) throw new Exception("Packed grid writer was given a grid with different size than the initial grid");
+
+        Array.Clear(buffer);
+        int i = 0;
+        for (int y = 0; y < height; y++)
+        {
+            for (int x = 0; x < width; x++, i++)
+            {
+                if (grid[x, y] > 0) buffer[i >> 3] |= (byte)(0x80 >> (i & 7));
+            }
+        }
+
+        stream.Write(step);
+        stream.Write(buffer);
+    }
+
+    public void Dispose()
+    {
+        stream.Dispose();
+    }
+}
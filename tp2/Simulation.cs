@@ -25,10 +25,11 @@ public class Simulation : IDisposable
     private readonly Random random;
 
     private readonly StreamWriter? outputStream;
+    private readonly PackedGridWriter? packedOutputWriter;
     private readonly StreamWriter? consensoStream;
     private readonly StreamWriter? clusterStatsStream;
 
-    public Simulation(sbyte[,] grid, float probability, uint? maxSteps, float consensusEpsilon, uint continueAfterConsensus, Random random, string? outputFile, string? consensoFile, string? clusterStatsFile, bool includeClusterStats)
+    public Simulation(sbyte[,] grid, float probability, uint? maxSteps, float consensusEpsilon, uint continueAfterConsensus, Random random, string? outputFile, bool packedOutput, string? consensoFile, string? clusterStatsFile, bool includeClusterStats)
     {
         Grid = grid;
         Probability = probability;
@@ -42,7 +43,10 @@ public class Simulation : IDisposable
 
         this.random = random;
 
-        outputStream = outputFile == null ? null : File.CreateText(outputFile);
+        if (outputFile != null && packedOutput)
+            packedOutputWriter = new PackedGridWriter(outputFile, grid.GetLength(0), grid.GetLength(1), probability);
+        else
+            outputStream = outputFile == null ? null : File.CreateText(outputFile);
         consensoStream = consensoFile == null ? null : File.CreateText(consensoFile);
         clusterStatsStream = clusterStatsFile == null ? null : File.CreateText(clusterStatsFile);
     }
@@ -116,16 +120,22 @@ public class Simulation : IDisposable
 
     private void SaveDataToFiles(float m, in ClusterStats? clusterStats)
     {
-        for (int y = 0; y < Grid.GetLength(1); y++)
+        // Steps is only incremented after saving, so the index of the grid being saved is its position in the history
+        packedOutputWriter?.Save((uint)(consensusHistory.Count - 1), Grid);
+
+        if (outputStream != null)
         {
-            for (int x = 0; x < Grid.GetLength(0); x++)
+            for (int y = 0; y < Grid.GetLength(1); y++)
             {
-                if (x != 0 || y != 0) outputStream?.Write(' ');
-                outputStream?.Write(Grid[x, y]);
+                for (int x = 0; x < Grid.GetLength(0); x++)
+                {
+                    if (x != 0 || y != 0) outputStream.Write(' ');
+                    outputStream.Write(Grid[x, y]);
+                }
             }
-        }
 
-        outputStream?.WriteLine();
+            outputStream.WriteLine();
+        }
 
         if (consensoStream != null)
         {
@@ -170,6 +180,7 @@ public class Simulation : IDisposable
     public void Dispose()
     {
         outputStream?.Dispose();
+        packedOutputWriter?.Dispose();
         consensoStream?.Dispose();
         clusterStatsStream?.Dispose();
     }
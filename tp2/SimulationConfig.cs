@@ -18,6 +18,10 @@ public class SimulationConfig
     public int? RandomSeed { get; set; } = null;
 
     public string? OutputFile { get; set; } = null;
+    /// <summary>
+    /// Writes OutputFile in the packed format (see file_format.txt) instead of as text, with its extension changed to .bin.
+    /// </summary>
+    public bool PackedOutput { get; set; } = false;
     public string? ConsensoFile { get; set; } = null;
     public string? ClusterStatsFile { get; set; } = null;
 
@@ -77,7 +81,8 @@ public class SimulationConfig
             ConsensusEpsilon,
             ContinueAfterConsensus,
             random,
-            OutputFile,
+            PackedOutput && OutputFile != null ? Path.ChangeExtension(OutputFile, ".bin") : OutputFile,
+            PackedOutput,
             ConsensoFile,
             ClusterStatsFile,
             IncludeClusterStats
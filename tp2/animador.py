@@ -1,6 +1,7 @@
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
+from grid_reader import open_grids
 
 # Los índices de los fotogramas a mostrar (inclusive ambos)
 from_frame = 0
@@ -13,32 +14,27 @@ skip_frames = 1
 interval = 10
 
 # Parámetros de la grilla
-N = 50                    # Tamaño de la grilla (debe coincidir con el usado en la simulación)
-input_file = "./bin/Debug/net8.0/output-250-0.01.txt"  # Archivo generado por simulador.py
-
-# Leer las grillas desde el archivo
-grids = []
-with open(input_file, "r") as f:
-    frame_index = 0
-    for line in f:
-        if frame_index >= from_frame and (to_frame is None or frame_index <= to_frame) and (frame_index - from_frame) % skip_frames == 0:
-            flat = np.array(list(map(int, line.strip().split())))  # Usa split() para manejar espacios
-            grid = flat.reshape((N, N))
-            grids.append((frame_index, grid))
-        frame_index += 1
+N = None                  # Tamaño de la grilla (None: se deduce del archivo)
+input_file = "./bin/Debug/net8.0/output-250-0.01.txt"  # Archivo generado por simulador.py (texto, o .bin si es empaquetado)
+
+# Las grillas se leen del archivo a demanda en cada fotograma, sin cargarlas todas en memoria
+grid_file = open_grids(input_file, N)
+frame_indices = grid_file.frame_indices(from_frame, to_frame, skip_frames)
 
 # Crear la animación
 fig, ax = plt.subplots()
-im = ax.imshow(grids[0][1], cmap='gray', vmin=-1, vmax=1)  # Ajuste de colores para {-1,1}
+im = ax.imshow(grid_file.read_frame(frame_indices[0]), cmap='gray', vmin=-1, vmax=1)  # Ajuste de colores para {-1,1}
 
 initialdelay = 300
 def update(frame):
     frame = max(frame - initialdelay, 0)
-    im.set_data(grids[frame][1])
-    ax.set_title(f"Paso {grids[frame][0]}")
+    im.set_data(grid_file.read_frame(frame_indices[frame]))
+    ax.set_title(f"Paso {frame_indices[frame]}")
     return [im]
 
-ani = animation.FuncAnimation(fig, update, frames=len(grids), interval=interval, blit=True)
+ani = animation.FuncAnimation(fig, update, frames=len(frame_indices), interval=interval, blit=True)
 
 plt.tight_layout()
 plt.show()
+
+grid_file.close()
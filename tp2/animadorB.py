@@ -4,31 +4,30 @@ import matplotlib.animation as animation
 import glob
 import re
 import os
+from grid_reader import open_grids
 
 # Parámetros
-N = 50  # Tamaño de la grilla
+N = None  # Tamaño de la grilla (None: se deduce del archivo)
 max_duration_secs = 15
 skip_frames = 1
 
-# Buscar archivos
-file_pattern = "./bin/Debug/net8.0/output-b-*.txt"
-files = glob.glob(file_pattern)
-files.sort(key=lambda x: float(re.search(r"output-b-(\d+\.\d+)\.txt", x).group(1)))
+# Buscar archivos, en texto o empaquetados
+file_patterns = ["./bin/Debug/net8.0/output-b-*.txt", "./bin/Debug/net8.0/output-b-*.bin"]
+files = [file for pattern in file_patterns for file in glob.glob(pattern)]
+files.sort(key=lambda x: float(re.search(r"output-b-(\d+\.\d+)\.(txt|bin)", x).group(1)))
 
 # Mostrar una animación por archivo
 for i, file in enumerate(files):
     print(f"▶️ Mostrando animación {i+1} de {len(files)}: {os.path.basename(file)}")
 
-    grids = []
-    with open(file, "r") as f:
-        for line in f:
-            flat = np.array(list(map(int, line.strip().split())))
-            grid = flat.reshape((N, N))
-            grids.append(grid)
+    # Las grillas se leen del archivo a demanda en cada fotograma
+    grid_file = open_grids(file, N)
+    frame_indices = grid_file.frame_indices(skip_frames=skip_frames)
 
-    num_frames = len(grids)
+    num_frames = len(frame_indices)
     if num_frames == 0:
         print(f"⚠️  {file} está vacío, se salta.")
+        grid_file.close()
         continue
 
     # Calcular duración por frame
@@ -37,14 +36,15 @@ for i, file in enumerate(files):
 
     # Crear y mostrar animación
     fig, ax = plt.subplots()
-    im = ax.imshow(grids[0], cmap='gray', vmin=-1, vmax=1)
+    im = ax.imshow(grid_file.read_frame(0), cmap='gray', vmin=-1, vmax=1)
     ax.set_title(f"{os.path.basename(file)} - Paso 0")
 
     def update(frame):
-        im.set_data(grids[frame])
-        ax.set_title(f"{os.path.basename(file)} - Paso {frame}")
+        im.set_data(grid_file.read_frame(frame_indices[frame]))
+        ax.set_title(f"{os.path.basename(file)} - Paso {frame_indices[frame]}")
         return [im]
 
     ani = animation.FuncAnimation(fig, update, frames=num_frames, interval=interval, blit=True)
     plt.tight_layout()
     plt.show()
+    grid_file.close()
@@ -0,0 +1,167 @@
+"""
+Consenso y susceptibilidad en el estacionario calculados directamente de los archivos de grillas de la simulación
+(output-{N}-{p}.txt, o .bin si son empaquetados), uno por cada (N, p).
+
+Para cada archivo se calcula M(t) = |Σ s| / N² de todos los pasos, se detecta desde qué paso M(t) es estacionario y
+con los pasos desde ahí se obtienen <M>, su desvío y χ = N² (<M²> - <M>²), como en
+Simulation.CalculateSusceptibility. Los archivos se reparten en un pool de procesos y los resultados se guardan en un
+CSV que leen grafico_c_consenso.py y grafico_c_susceptibilidad.py:
+
+    python consenso.py "./bin/Debug/net8.0/output-*-*.txt" -o resultados_consenso.csv
+"""
+
+import argparse
+import glob
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+
+from grid_reader import open_grids
+
+# Celdas leídas por vez al calcular M(t), para que la memoria no dependa del largo de la simulación
+CELDAS_POR_LOTE = 1 << 24
+
+# Pasos por bloque al detectar el estacionario
+VENTANA = 1000
+
+COLUMNAS = ['N', 'p', 'consenso', 'desvio', 'susceptibilidad', 'inicio_estacionario', 'pasos']
+COLUMNAS_ENTERAS = ('N', 'inicio_estacionario', 'pasos')
+
+NOMBRE_ARCHIVO = re.compile(r"output-(\d+)-(\d+(?:\.\d+)?(?:E-?\d+)?)\.(txt|bin)$", re.IGNORECASE)
+
+
+def consensus_series(grids):
+    """M(t) de cada fotograma de grids (un GridFile o PackedGridFile), sumando lotes (K, N, N) de una vez."""
+    alto, ancho = grids.shape
+    celdas = alto * ancho
+    por_lote = max(1, CELDAS_POR_LOTE // celdas)
+
+    M = np.empty(len(grids))
+    for inicio in range(0, len(grids), por_lote):
+        lote = grids.read_frames(np.arange(inicio, min(inicio + por_lote, len(grids))))
+        M[inicio:inicio + len(lote)] = np.abs(lote.sum(axis=(1, 2), dtype=np.int64)) / celdas
+    return M
+
+
+def stationary_start(M, ventana=VENTANA, tolerancia=None):
+    """
+    El primer paso desde el que M(t) es estacionario. M se parte en bloques de ventana pasos y se toma como
+    referencia el promedio de la segunda mitad; el estacionario empieza en el primer bloque desde el cual todos los
+    promedios de bloque están a menos de tolerancia de la referencia. Por defecto tolerancia es 3 veces el desvío de
+    los promedios de los bloques de la segunda mitad.
+    """
+    bloques = len(M) // ventana
+    if bloques < 2:
+        return 0
+
+    promedios = M[:bloques * ventana].reshape(bloques, ventana).mean(axis=1)
+    referencia = promedios[bloques // 2:]
+    if tolerancia is None:
+        tolerancia = 3 * referencia.std()
+
+    fuera = np.flatnonzero(np.abs(promedios - referencia.mean()) > tolerancia)
+    return 0 if len(fuera) == 0 else int(min(fuera[-1] + 1, bloques // 2)) * ventana
+
+
+def stationary_stats(M, desde, celdas):
+    """(<M>, desvío de M, χ) con los pasos de M desde el paso desde en adelante."""
+    estacionario = M[desde:]
+    M_prom = estacionario.mean()
+    return M_prom, estacionario.std(), celdas * ((estacionario ** 2).mean() - M_prom ** 2)
+
+
+def parse_name(path):
+    """(N, p) del nombre de un archivo output-{N}-{p}.txt o .bin, o None si el nombre no tiene esa forma."""
+    match = NOMBRE_ARCHIVO.search(os.path.basename(path))
+    return None if match is None else (int(match.group(1)), float(match.group(2)))
+
+
+def analyze_file(path, ventana=VENTANA, ultimos=None):
+    """
+    Una fila de COLUMNAS para el archivo de grillas path. Con ultimos se usan los últimos ultimos pasos en lugar de
+    detectar el estacionario, contados como en ProbabilityGraphProgram: el Skip(MaxSteps - ultimos) sobre las
+    MaxSteps + 1 grillas deja ultimos + 1 valores de M.
+    """
+    with open_grids(path) as grids:
+        M = consensus_series(grids)
+        alto, ancho = grids.shape
+        p = getattr(grids, 'p', None)
+
+    if len(M) == 0:
+        raise ValueError(f"{path} no tiene fotogramas")
+    if p is not None:
+        # El float de C# escrito en el encabezado, con los mismos dígitos que en el nombre del archivo
+        p = float(str(np.float32(p)))
+    elif parse_name(path) is not None:
+        p = parse_name(path)[1]
+    else:
+        raise ValueError(f"No se puede saber el p de {path}: el nombre no es output-N-p.txt")
+
+    if ultimos is not None:
+        desde = max(len(M) - 1 - ultimos, 0)
+    else:
+        desde = stationary_start(M, ventana)
+    M_prom, M_std, chi = stationary_stats(M, desde, alto * ancho)
+    return [ancho, p, M_prom, M_std, chi, desde, len(M)]
+
+
+def analyze_files(paths, ventana=VENTANA, ultimos=None, max_workers=None):
+    """
+    Las filas de analyze_file de todos los archivos, ordenadas por N y p, como un array estructurado con COLUMNAS.
+    Cada archivo se procesa en un proceso del pool. Un archivo que no se puede procesar se avisa y se saltea.
+
+    Los scripts que lo llamen tienen que hacerlo bajo if __name__ == "__main__", porque los procesos los importan.
+    """
+    analizar = partial(analyze_file, ventana=ventana, ultimos=ultimos)
+    filas = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for path, futuro in [(path, executor.submit(analizar, path)) for path in paths]:
+            try:
+                filas.append(tuple(futuro.result()))
+            except (OSError, ValueError) as e:
+                print(f"[AVISO] No se pudo procesar {path}: {e}")
+
+    tipo = np.dtype([(columna, np.int64 if columna in COLUMNAS_ENTERAS else np.float64) for columna in COLUMNAS])
+    return np.sort(np.array(filas, dtype=tipo), order=['N', 'p'])
+
+
+def save_results(resultados, path):
+    np.savetxt(path, resultados, delimiter=',', header=','.join(COLUMNAS), comments='',
+               fmt=['%d', '%.9g', '%.9g', '%.9g', '%.9g', '%d', '%d'])
+
+
+def load_results(path):
+    """Los resultados guardados por save_results, como un diccionario N -> array estructurado ordenado por p."""
+    resultados = np.atleast_1d(np.genfromtxt(path, delimiter=',', names=True, dtype=None))
+    return {int(N): np.sort(resultados[resultados['N'] == N], order='p') for N in np.unique(resultados['N'])}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Consenso y susceptibilidad en el estacionario de cada (N, p)")
+    parser.add_argument("patterns", nargs="+", help="archivos de grillas output-N-p.txt/.bin (acepta comodines)")
+    parser.add_argument("-o", "--output", default="resultados_consenso.csv", help="CSV de salida")
+    parser.add_argument("--ventana", type=int, default=VENTANA, help="pasos por bloque al detectar el estacionario")
+    parser.add_argument("--ultimos", type=int, default=None,
+                        help="usar los últimos pasos en lugar de detectar el estacionario (ultimos + 1 grillas, como "
+                             "ProbabilityGraphProgram)")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="procesos del pool (por defecto uno por núcleo)")
+    args = parser.parse_args()
+
+    paths = sorted({path for pattern in args.patterns for path in (glob.glob(pattern) or [pattern])})
+    paths = [path for path in paths if path.endswith('.bin') or parse_name(path) is not None]
+    resultados = analyze_files(paths, args.ventana, args.ultimos, args.workers)
+    save_results(resultados, args.output)
+
+    for fila in resultados:
+        print(f"N={fila['N']} p={fila['p']:g}: <M>={fila['consenso']:.6f} ± {fila['desvio']:.6f}, "
+              f"χ={fila['susceptibilidad']:.6f} "
+              f"(estacionario desde el paso {fila['inicio_estacionario']} de {fila['pasos']})")
+    print(f"Resultados guardados en {args.output}")
+
+
+if __name__ == "__main__":
+    main()
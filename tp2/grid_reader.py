@@ -0,0 +1,212 @@
+import os
+
+import numpy as np
+
+# Bytes leídos por vez al buscar los saltos de línea
+TAMANO_BLOQUE = 1 << 24
+
+# Fotogramas parseados juntos al recorrer un rango con iter_frames
+FOTOGRAMAS_POR_LECTURA = 256
+
+
+def _indexar_lineas(path):
+    """
+    Offsets del comienzo de cada línea completa del archivo, más uno final donde termina la última (T + 1 valores
+    para T líneas). Una última línea sin salto de línea (simulación cortada a la mitad) se ignora.
+    """
+    inicios = [np.zeros(1, dtype=np.int64)]
+    offset = 0
+    with open(path, 'rb') as f:
+        while True:
+            bloque = f.read(TAMANO_BLOQUE)
+            if not bloque:
+                break
+            saltos = np.flatnonzero(np.frombuffer(bloque, dtype=np.uint8) == ord('\n'))
+            inicios.append(saltos.astype(np.int64) + offset + 1)
+            offset += len(bloque)
+    return np.concatenate(inicios)
+
+
+def _clave(path):
+    stat = os.stat(path)
+    return np.array([stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+
+
+def _leer_indice(path, use_cache):
+    """
+    Índice de líneas de path. Se guarda junto al archivo (.index.npz) y se reusa mientras no cambien su tamaño ni
+    su fecha de modificación.
+    """
+    clave = _clave(path)
+    cache_path = path + '.index.npz'
+    if use_cache and os.path.exists(cache_path):
+        with np.load(cache_path) as cache:
+            if np.array_equal(cache['clave'], clave):
+                return cache['offsets']
+
+    offsets = _indexar_lineas(path)
+    if use_cache:
+        try:
+            np.savez(cache_path, clave=clave, offsets=offsets)
+        except OSError as e:
+            print(f"No se pudo guardar el índice de {path}: {e}")
+    return offsets
+
+
+class _GridFrames:
+    """
+    Lo común a los dos formatos de grillas: recorrer rangos de fotogramas a partir de read_frames, que cada formato
+    implementa devolviendo un array int8 (K, alto, ancho).
+    """
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def frame_indices(self, from_frame=0, to_frame=None, skip_frames=1):
+        """Los índices de los fotogramas desde from_frame hasta to_frame (inclusive ambos), uno cada skip_frames."""
+        ultimo = len(self) - 1 if to_frame is None else min(to_frame, len(self) - 1)
+        return np.arange(from_frame, ultimo + 1, skip_frames)
+
+    def _validar_indices(self, indices):
+        indices = np.asarray(indices, dtype=np.int64)
+        if len(indices) != 0 and (indices.min() < 0 or indices.max() >= len(self)):
+            raise IndexError(f"{self.path} tiene {len(self)} fotogramas")
+        return indices
+
+    def read_frame(self, index):
+        """La grilla del fotograma index, un array int8 (alto, ancho)."""
+        return self.read_frames([index])[0]
+
+    def iter_frames(self, from_frame=0, to_frame=None, skip_frames=1):
+        """
+        Recorre los fotogramas de frame_indices(from_frame, to_frame, skip_frames) devolviendo (índice, grilla).
+        Se leen de a FOTOGRAMAS_POR_LECTURA por vez, así que la memoria usada no depende del largo del archivo.
+        """
+        indices = self.frame_indices(from_frame, to_frame, skip_frames)
+        for inicio in range(0, len(indices), FOTOGRAMAS_POR_LECTURA):
+            lote = indices[inicio:inicio + FOTOGRAMAS_POR_LECTURA]
+            yield from zip(lote.tolist(), self.read_frames(lote))
+
+
+class GridFile(_GridFrames):
+    """
+    Archivo de grillas escrito por la simulación: una línea por paso con las N * N celdas (-1 o 1) separadas por
+    espacios, fila por fila. Con un índice de dónde empieza cada línea, los fotogramas se leen a demanda con un seek
+    y se parsean con numpy a int8, sin cargar el archivo entero en memoria.
+
+    N es el lado de la grilla; si no se da se deduce de la primera línea.
+    """
+    def __init__(self, path, N=None, use_cache=True):
+        self.path = path
+        self.offsets = _leer_indice(path, use_cache)
+        self._file = open(path, 'rb')
+
+        if N is None and len(self) > 0:
+            celdas = len(self._leer_texto(0, 1).split())
+            N = int(round(np.sqrt(celdas)))
+            if N * N != celdas:
+                raise ValueError(f"Las líneas de {path} tienen {celdas} celdas, que no forman una grilla cuadrada")
+        self.N = N
+        self.shape = (N, N)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def close(self):
+        self._file.close()
+
+    def _leer_texto(self, desde, hasta):
+        self._file.seek(self.offsets[desde])
+        return self._file.read(self.offsets[hasta] - self.offsets[desde])
+
+    def read_frames(self, indices):
+        """
+        Las grillas de los fotogramas indices como un array int8 (K, N, N). Los índices consecutivos se leen con una
+        sola lectura, y el texto de todos se parsea de una vez.
+        """
+        indices = self._validar_indices(indices)
+        if len(indices) == 0:
+            return np.empty((0, self.N, self.N), dtype=np.int8)
+
+        # Separar en tramos de índices consecutivos
+        cortes = np.flatnonzero(np.diff(indices) != 1) + 1
+        inicios = np.concatenate([[0], cortes])
+        finales = np.concatenate([cortes, [len(indices)]])
+        texto = b' '.join(self._leer_texto(indices[i], indices[j - 1] + 1) for i, j in zip(inicios, finales))
+
+        celdas = np.fromstring(texto.decode('ascii'), dtype=np.int8, sep=' ')
+        if len(celdas) != len(indices) * self.N * self.N:
+            raise ValueError(f"Los fotogramas de {self.path} no tienen {self.N} * {self.N} celdas")
+        return celdas.reshape(len(indices), self.N, self.N)
+
+
+def packed_header_dtype():
+    """Tipo del encabezado del archivo empaquetado (ver file_format.txt): (int ancho, int alto, float p)."""
+    return np.dtype([('width', '<i4'), ('height', '<i4'), ('p', '<f4')])
+
+
+def packed_step_dtype(width, height):
+    """Tipo de registro de un paso del archivo empaquetado: (int step, un bit por celda)."""
+    return np.dtype([('step', '<u4'), ('cells', 'u1', ((width * height + 7) // 8,))])
+
+
+class PackedGridFile(_GridFrames):
+    """
+    Archivo de grillas empaquetado, escrito por la simulación con PackedOutput (un bit por celda, ver
+    file_format.txt). Los registros se mapean en memoria, así que leer fotogramas solo toca los bytes de esos pasos,
+    y se desempaquetan todos juntos con np.unpackbits.
+    """
+    def __init__(self, path):
+        self.path = path
+        header = np.fromfile(path, dtype=packed_header_dtype(), count=1)
+        if len(header) == 0:
+            raise ValueError(f"{path} no tiene el encabezado de un archivo empaquetado")
+        width, height, p = header[0].item()
+        self.shape = (height, width)
+        self.N = width if width == height else None
+        self.p = p
+
+        # Un último registro incompleto (simulación cortada a la mitad) se ignora
+        dtype = packed_step_dtype(width, height)
+        count = (os.path.getsize(path) - header.itemsize) // dtype.itemsize
+        if count > 0:
+            self.records = np.memmap(path, dtype=dtype, mode='r', offset=header.itemsize, shape=(count,))
+        else:
+            self.records = np.empty(0, dtype=dtype)
+        self.steps = self.records['step']
+
+    def __len__(self):
+        return len(self.records)
+
+    def close(self):
+        # Soltar el mapeo; los arrays que ya se devolvieron no dependen de él
+        self.records = self.records[:0].copy()
+        self.steps = self.records['step']
+
+    def read_frames(self, indices):
+        """Las grillas de los fotogramas indices como un array int8 (K, alto, ancho), con valores -1 y 1."""
+        indices = self._validar_indices(indices)
+        height, width = self.shape
+        celdas = np.unpackbits(self.records['cells'][indices], axis=1, count=width * height).view(np.int8)
+        celdas *= 2
+        celdas -= 1
+        return celdas.reshape(len(indices), height, width)
+
+
+def is_packed(path):
+    """
+    Si path es un archivo de grillas empaquetado. Se mira el contenido y no la extensión: el texto solo tiene '-', '1',
+    espacios y saltos de línea, mientras que los int del encabezado empaquetado tienen bytes en 0.
+    """
+    with open(path, 'rb') as f:
+        inicio = f.read(packed_header_dtype().itemsize)
+    return len(inicio.translate(None, b'-1 \r\n')) != 0
+
+
+def open_grids(path, N=None):
+    """Abre un archivo de grillas en cualquiera de los dos formatos, según lo que diga is_packed."""
+    if is_packed(path):
+        return PackedGridFile(path)
+    return GridFile(path, N)
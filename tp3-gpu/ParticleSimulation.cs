@@ -43,6 +43,7 @@ public class ParticleSimulation : IDisposable
     private static readonly BlendState minBlendState = new BlendState(false, BlendingMode.Min, BlendingFactor.One, BlendingFactor.One);
 
     private SimulationFileSaver? fileSaver;
+    private SimulationEventSaver? eventSaver;
 
     public ParticleSimulation(GraphicsDevice graphicsDevice, SimulationConfig config, uint particleBuffersCount = 2)
     {
@@ -106,8 +107,9 @@ public class ParticleSimulation : IDisposable
         RecalculateMinTimeToCollision();
 
         // File saver :-)
-        fileSaver = config.OutputFile == null ? null : new SimulationFileSaver(ContainerRadius, config.ParticleConstsSpan, config.OutputFile);
+        fileSaver = config.OutputFile == null ? null : new SimulationFileSaver(ContainerRadius, config.ParticleConstsSpan, config.OutputFile, config.SaveEverySteps);
         fileSaver?.Save(Steps, SecondsElapsed, particleVarsBuffers[0]);
+        eventSaver = config.EventsFile == null ? null : new SimulationEventSaver(ContainerRadius, config.ParticleConstsSpan, config.EventsFile);
     }
 
     private void RecalculateMinTimeToCollision()
@@ -176,14 +178,19 @@ public class ParticleSimulation : IDisposable
         simulationAdvanceProgram.Uniforms["deltaTime"].SetValueFloat(TimeToNextCollision);
         graphicsDevice.DrawArrays(PrimitiveType.TriangleStrip, 0, vertexBuffer.StorageLength);
 
+        float deltaTime = TimeToNextCollision;
         Steps++;
-        SecondsElapsed += TimeToNextCollision;
+        SecondsElapsed += deltaTime;
 
         RecalculateMinTimeToCollision();
 
         // Save state to file
         fileSaver?.Save(Steps, SecondsElapsed, particleVarsBuffers[0]);
 
+        // Save the bounces of this step, comparing the previous buffer (still holding the times to collision used to
+        // advance) with the new one
+        eventSaver?.Save(Steps, SecondsElapsed, deltaTime, particleVarsBuffers[1], particleVarsBuffers[0]);
+
         // PositionAndVelocity[] posandvel1 = new PositionAndVelocity[ParticleCount];
         // TimeToCollisionAndCollidesWith[] timetocol1 = new TimeToCollisionAndCollidesWith[ParticleCount];
         // particleVarsBuffers[0].PositionAndVelocity.Texture.GetData<PositionAndVelocity>(posandvel1);
@@ -193,6 +200,7 @@ public class ParticleSimulation : IDisposable
     public void Dispose()
     {
         fileSaver?.Dispose();
+        eventSaver?.Dispose();
         vertexBuffer.Dispose();
         simulationAdvanceProgram.Dispose();
         simulationCalctimeProgram.Dispose();
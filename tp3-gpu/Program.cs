@@ -32,16 +32,19 @@ class Program
         // RunSims(fixedObstacle: false, particleCount: 250, speed: 1, 30000, runs: 16);
     }
 
-    private static void RunSims(bool fixedObstacle, int particleCount, float speed, uint maxSteps, int runs, bool visualize = false)
+    private static void RunSims(bool fixedObstacle, int particleCount, float speed, uint maxSteps, int runs, bool visualize = false, uint saveEverySteps = 1)
     {
         string obstacleTypeStr = fixedObstacle ? "fixed" : "moving";
 
         for (int i = 0; i < runs; i++)
         {
+            string outputName = $"output{i + 1}-{obstacleTypeStr}obstacle-{particleCount}particles-vel{speed}-{maxSteps / 1000}ksteps";
             SimulationConfig config = new SimulationConfig()
                 {
                     ContainerRadius = 0.05f,
-                    OutputFile = $"output{i + 1}-{obstacleTypeStr}obstacle-{particleCount}particles-vel{speed}-{maxSteps / 1000}ksteps.sim",
+                    OutputFile = $"{outputName}.sim",
+                    SaveEverySteps = saveEverySteps,
+                    EventsFile = $"{outputName}.events",
                     MaxSteps = maxSteps,
                     //MaxSimulationTime = 60,
                 }
@@ -16,6 +16,9 @@ public class SimulationConfig
     public float? MaxSimulationTime { get; init; } = null;
 
     public string? OutputFile { get; init; } = null;
+    public uint SaveEverySteps { get; init; } = 1;
+
+    public string? EventsFile { get; init; } = null;
 
     private Random? r;
     private readonly List<ParticleConsts> particleConsts = new();
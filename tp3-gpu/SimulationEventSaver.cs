@@ -0,0 +1,90 @@
+namespace tp3_gpu;
+
+/// <summary>
+/// Writes a log with one record per particle that bounces on each step, instead of the whole state. See
+/// file_format.txt for the layout.
+/// </summary>
+public class SimulationEventSaver : IDisposable
+{
+    public const int WallPartner = -1;
+
+    public String Filename { get; }
+
+    private readonly BinaryWriter stream;
+
+    private PositionAndVelocity[] previousBuf;
+    private PositionAndVelocity[] currentBuf;
+    private TimeToCollisionAndCollidesWith[] collisionBuf;
+
+    public SimulationEventSaver(float containerRadius, ReadOnlySpan<ParticleConsts> particleConsts, String filename)
+    {
+        Filename = filename;
+        stream = new BinaryWriter(new FileStream(filename, FileMode.Create, FileAccess.Write, FileShare.Read));
+        previousBuf = new PositionAndVelocity[particleConsts.Length];
+        currentBuf = new PositionAndVelocity[particleConsts.Length];
+        collisionBuf = new TimeToCollisionAndCollidesWith[particleConsts.Length];
+        WriteStart(containerRadius, particleConsts);
+    }
+
+    private void WriteStart(float containerRadius, ReadOnlySpan<ParticleConsts> particleConsts)
+    {
+        stream.Write(containerRadius);
+        stream.Write((uint)particleConsts.Length);
+
+        for (int i = 0; i < particleConsts.Length; ++i)
+        {
+            stream.Write(particleConsts[i].Mass);
+            stream.Write(particleConsts[i].Radius);
+        }
+    }
+
+    /// <summary>
+    /// Saves the bounces of the step that just advanced from previous to current by deltaTime. A particle bounced if
+    /// its time to collision in previous was at most deltaTime, which is the same check the advance shader does.
+    /// </summary>
+    public void Save(uint step, float time, float deltaTime, in ParticleVarsBuffer previous, in ParticleVarsBuffer current)
+    {
+        int particleCount = (int)(previous.PositionAndVelocity.Width * previous.PositionAndVelocity.Height);
+        if (previousBuf.Length != particleCount) throw new Exception("Event saver was given a state buffer with different size than the initial buffer");
+
+        previous.TimeToCollisionAndCollidesWith.Texture.GetData<TimeToCollisionAndCollidesWith>(collisionBuf);
+
+        bool anyCollision = false;
+        for (int i = 0; i < collisionBuf.Length && !anyCollision; ++i)
+            anyCollision = collisionBuf[i].TimeToCollision - deltaTime <= 0;
+
+        if (!anyCollision)
+            return;
+
+        previous.PositionAndVelocity.Texture.GetData<PositionAndVelocity>(previousBuf);
+        current.PositionAndVelocity.Texture.GetData<PositionAndVelocity>(currentBuf);
+        int sizeX = (int)previous.PositionAndVelocity.Width;
+
+        for (int i = 0; i < collisionBuf.Length; ++i)
+        {
+            if (collisionBuf[i].TimeToCollision - deltaTime > 0)
+                continue;
+
+            int otherX = (int)collisionBuf[i].CollidesWith.X;
+            int otherY = (int)collisionBuf[i].CollidesWith.Y;
+            int partner = otherX < 0 ? WallPartner : otherY * sizeX + otherX;
+
+            stream.Write(step);
+            stream.Write(time);
+            stream.Write((uint)i);
+            stream.Write(partner);
+            stream.Write(currentBuf[i].Position.X);
+            stream.Write(currentBuf[i].Position.Y);
+            stream.Write(previousBuf[i].Velocity.X);
+            stream.Write(previousBuf[i].Velocity.Y);
+            stream.Write(currentBuf[i].Velocity.X);
+            stream.Write(currentBuf[i].Velocity.Y);
+        }
+    }
+
+    public void Dispose()
+    {
+        stream.Flush();
+        stream.Dispose();
+    }
+}
@@ -6,14 +6,18 @@ namespace tp3_gpu;
 public class SimulationFileSaver : IDisposable
 {
     public String Filename { get; }
+    public uint SaveEverySteps { get; }
 
     private readonly BinaryWriter stream;
 
     private PositionAndVelocity[] tmpbuf;
 
-    public SimulationFileSaver(float containerRadius, ReadOnlySpan<ParticleConsts> particleConsts, String filename)
+    public SimulationFileSaver(float containerRadius, ReadOnlySpan<ParticleConsts> particleConsts, String filename, uint saveEverySteps = 1)
     {
+        if (saveEverySteps == 0) throw new ArgumentException("SaveEverySteps must be at least 1", nameof(saveEverySteps));
+
         Filename = filename;
+        SaveEverySteps = saveEverySteps;
         stream = new BinaryWriter(new FileStream(filename, FileMode.Create, FileAccess.Write, FileShare.Read));
         tmpbuf = new PositionAndVelocity[particleConsts.Length];
         WriteStart(containerRadius, particleConsts);
@@ -37,6 +41,9 @@ public class SimulationFileSaver : IDisposable
 
     public void Save(uint step, float time, in ParticleVarsBuffer particleVarsBuffer)
     {
+        if (step % SaveEverySteps != 0)
+            return;
+
         int particleCount = (int)(particleVarsBuffer.PositionAndVelocity.Width * particleVarsBuffer.PositionAndVelocity.Height);
         if (tmpbuf.Length != particleCount) throw new Exception("File saver was given a state buffer with different size than the initial buffer");
 
@@ -15,52 +15,24 @@ Uso:
     -r 0.005 --tol-factor 0.00001
 """
 
-import os, re, struct, argparse
+import os, re, argparse
 import numpy as np
 import matplotlib.pyplot as plt
 
-def read_collisions(simfile, R_obst, tol_factor):
-    data = open(simfile, "rb").read()
-    offset = 0
-    offset += 4  # container_radius
-    N = struct.unpack_from("I", data, offset)[0]; offset += 4
-    radii = np.empty(N, dtype=np.float32)
-    for i in range(N):
-        _, r = struct.unpack_from("ff", data, offset)
-        radii[i] = r
-        offset += 8
-
-    hit_first   = np.zeros(N, bool)
-    times_first = []
-    times_all   = []
-    t_final     = 0.0
-
-    while offset + 8 + 16*N <= len(data):
-        _, t = struct.unpack_from("If", data, offset)
-        offset += 8
-        pos = np.empty((N,2), dtype=np.float32)
-        for i in range(N):
-            x,y,_,_ = struct.unpack_from("ffff", data, offset)
-            pos[i] = (x,y)
-            offset += 16
-        t_final = t
+from file_loader import EventData, SimulationData
+from collisions import obstacle_collisions, obstacle_collisions_from_events
 
-        dist     = np.hypot(pos[:,0], pos[:,1])
-        sum_r    = R_obst + radii
-        tol      = tol_factor * sum_r
-        collided = np.abs(dist - sum_r) < tol
-
-        for i in np.nonzero(collided)[0]:
-            times_all.append(t)
-            if not hit_first[i]:
-                hit_first[i] = True
-                times_first.append(t)
-
-    return np.array(times_first), np.array(times_all), t_final
+def read_collisions(simfile, R_obst, tol_factor):
+    # Un archivo .events ya trae cada choque con el obstáculo, así que no se usan ni R_obst ni tol_factor
+    if simfile.endswith(".events"):
+        choques = obstacle_collisions_from_events(EventData(simfile, mmap=True))
+    else:
+        choques = obstacle_collisions(SimulationData(simfile, mmap=True), R_obst, tol_factor)
+    return choques.hit_first_times, choques.times, choques.t_final
 
 def main():
     p = argparse.ArgumentParser()
-    p.add_argument("simfiles", nargs="+", help="archivos .sim de distintas velocidades")
+    p.add_argument("simfiles", nargs="+", help="archivos .sim (o sus .events) de distintas velocidades")
     p.add_argument("-r","--obstacle-radius", type=float, default=0.005, help="radio del obstáculo (m)")
     p.add_argument("--tol-factor", type=float, default=0.5, help="tolerancia (fracción de R_obst+r_i)")
     args = p.parse_args()
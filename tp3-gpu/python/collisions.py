@@ -0,0 +1,94 @@
+import numpy as np
+
+from pressure import RADIO_OBSTACULO
+
+
+def obstacle_contacts(positions, radios, radio_obstaculo=RADIO_OBSTACULO, tol_factor=0.5):
+    """
+    Recibe positions de forma (T, N, 2) y devuelve una máscara (T, N) que indica en qué pasos cada partícula está en
+    contacto con el obstáculo centrado en el origen, es decir |dist - (R_obst + r_i)| < tol_factor * (R_obst + r_i).
+    """
+    dist = np.hypot(positions[..., 0], positions[..., 1])
+    suma_radios = radio_obstaculo + radios
+    return np.abs(dist - suma_radios) < tol_factor * suma_radios
+
+
+class ObstacleCollisions:
+    """
+    Choques contra el obstáculo de una simulación:
+      - times y particles: tiempo y partícula de cada choque, ordenados por paso y luego por índice de partícula.
+      - first_times: tiempo del primer choque de cada partícula, NaN si nunca choca.
+      - counts: cantidad de choques de cada partícula.
+      - t_final: tiempo del último paso.
+    """
+    def __init__(self, times, particles, first_times, counts, t_final):
+        self.times = times
+        self.particles = particles
+        self.first_times = first_times
+        self.counts = counts
+        self.t_final = t_final
+
+    @property
+    def hit_first_times(self):
+        """Tiempos del primer choque de las partículas que chocaron, en orden de índice de partícula."""
+        return self.first_times[~np.isnan(self.first_times)]
+
+
+def obstacle_collisions(sim, radio_obstaculo=RADIO_OBSTACULO, tol_factor=0.5, block_size=4096):
+    """
+    Detecta los choques contra el obstáculo de una SimulationData recorriendo el archivo por bloques de block_size
+    pasos. En cada bloque la máscara de contactos se calcula para todos los pasos y partículas a la vez; los choques
+    salen de np.nonzero y el primer choque de cada partícula de np.argmax sobre el eje de los pasos.
+    """
+    radios = sim.radios
+    tiempos = []
+    particulas = []
+    primeros = np.full(sim.N, np.nan, dtype=np.float32)
+    conteos = np.zeros(sim.N, dtype=np.int64)
+    t_final = 0.0
+
+    for _, times, state in sim.iter_blocks(block_size):
+        contactos = obstacle_contacts(state[..., 0:2], radios, radio_obstaculo, tol_factor)
+
+        pasos, indices = np.nonzero(contactos)
+        tiempos.append(times[pasos])
+        particulas.append(indices)
+        conteos += contactos.sum(axis=0)
+
+        nuevos = np.isnan(primeros) & contactos.any(axis=0)
+        primeros[nuevos] = times[contactos.argmax(axis=0)[nuevos]]
+        t_final = times[-1]
+
+    return ObstacleCollisions(
+        times=np.concatenate(tiempos) if tiempos else np.zeros(0, dtype=np.float32),
+        particles=np.concatenate(particulas) if particulas else np.zeros(0, dtype=np.int64),
+        first_times=primeros,
+        counts=conteos,
+        t_final=t_final,
+    )
+
+
+def obstacle_collisions_from_events(events, t_final=None):
+    """
+    Arma los choques contra el obstáculo de un EventData, que ya trae cada choque registrado, sin recorrer los pasos.
+    t_final es la duración de la simulación (por defecto, el tiempo del último choque del archivo).
+    """
+    choques = events.obstacle_hits()
+    tiempos = np.asarray(events.times[choques])
+    particulas = np.asarray(events.particles[choques], dtype=np.int64)
+
+    conteos = np.bincount(particulas, minlength=events.N).astype(np.int64)
+    primeros = np.full(events.N, np.nan, dtype=np.float32)
+    # Los choques están ordenados por tiempo, así que la primera aparición de cada partícula es su primer choque
+    chocaron, primera = np.unique(particulas, return_index=True)
+    primeros[chocaron] = tiempos[primera]
+
+    if t_final is None:
+        t_final = events.times[-1] if len(events.times) != 0 else 0.0
+    return ObstacleCollisions(
+        times=tiempos,
+        particles=particulas,
+        first_times=primeros,
+        counts=conteos,
+        t_final=t_final,
+    )
@@ -4,20 +4,23 @@ compute_msd_diffusion.py
 
 Lee todos los archivos .sim en outputs-movingobstacle/, extrae la
 trayectoria de la partícula grande (primera en cada archivo),
-calcula el MSD ⟨|r(t)-r₀|²⟩ promedio y desviación estándar,
+calcula el MSD ⟨|r(t₀+t)-r(t₀)|²⟩ de cada corrida promediando sobre
+todos los orígenes t₀ (con FFT, ver msd.py), y su promedio y
+desviación estándar entre corridas,
 ignora datos a partir del primer choque con el borde,
 ajusta una regresión lineal ⟨r²⟩ = 4 D t para extraer D,
 y dibuja el MSD con barras de error y línea de ajuste.
 """
 
 import os
-import struct
 import glob
 
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.ticker import ScalarFormatter
 
+from msd import cached_msd
+
 # ---- Parámetros ----
 DATA_DIR         = "./outputs-movingobstacle"
 FILE_PATTERN     = "output*-movingobstacle-*.sim"
@@ -25,79 +28,21 @@ PARTICLE_INDEX   = 0       # índice de la partícula grande
 PARTICLE_RADIUS  = 0.005   # radio de la partícula grande [m]
 N_SAMPLES        = 100     # número de tiempos uniformes
 FIT_START_FRAC   = 0.1     # descartar el primer 10% de t_max para el ajuste
-
-
-def read_sim_file(path):
-    """
-    Lee un archivo .sim y devuelve:
-      - container_radius: float
-      - times: array de tiempos (float)
-      - positions: array de shape (len(times), 2) con (x, y) de la partícula grande
-    """
-    times, positions = [], []
-    with open(path, "rb") as f:
-        # Leer container_radius (float)
-        container_radius = struct.unpack('f', f.read(4))[0]
-        # Leer número de partículas (uint32)
-        n = struct.unpack('I', f.read(4))[0]
-        # Leer masas y radios (skip)
-        f.read(n * 8)
-        # Leer steps
-        while True:
-            hdr = f.read(8)
-            if len(hdr) < 8:
-                break
-            _, t = struct.unpack("If", hdr)
-            data = f.read(n * 16)
-            if len(data) < n * 16:
-                break
-            off = PARTICLE_INDEX * 16
-            x, y, _, _ = struct.unpack_from("ffff", data, off)
-            times.append(t)
-            positions.append((x, y))
-    return container_radius, np.array(times), np.array(positions)
+OVERSAMPLE       = 1       # orígenes de tiempo por cada intervalo entre tiempos uniformes
+MSD_CACHE        = os.path.join(DATA_DIR, "msd.cache.npz")
 
 
 def main():
-    # 1) Listar archivos
+    # 1) Listar archivos y leer las corridas, cortadas al primer choque con el borde
     pattern = os.path.join(DATA_DIR, FILE_PATTERN)
     files = sorted(glob.glob(pattern))
     if not files:
         raise FileNotFoundError(f"No se encontraron archivos con patrón {pattern!r}")
 
-    runs = []  # lista de (t_run, pos_run) tras cortar al primer choque
-    for path in files:
-        container_radius, times, pos = read_sim_file(path)
-        # Umbral de choque contra borde:
-        threshold = container_radius - PARTICLE_RADIUS
-        # Calcular distancias al centro
-        d = np.linalg.norm(pos, axis=1)
-        # Encontrar primer índice donde choca contra el borde
-        idx = np.argmax(d >= threshold)
-        if d[idx] < threshold:
-            # nunca choca, usar todo
-            t_cut, pos_cut = times, pos
-        else:
-            # cortar hasta justo antes del choque
-            t_cut   = times[:idx]
-            pos_cut = pos[:idx]
-        # Guardar si hay datos suficientes
-        if t_cut.size > 1:
-            runs.append((t_cut, pos_cut))
-
-    if not runs:
-        raise RuntimeError("No hay datos válidos tras recortar bordes.")
-
-    # 2) Tiempo máximo común y retículo uniforme
-    t_max    = min(t[-1] for t, _ in runs)
-    t_common = np.linspace(0, t_max, N_SAMPLES)
-
-    # 3) Calcular MSD por corrida
-    msd_runs = []
-    for t_run, pos_run in runs:
-        disp2 = np.sum((pos_run - pos_run[0])**2, axis=1)
-        msd_runs.append(np.interp(t_common, t_run, disp2))
-    msd_runs = np.array(msd_runs)
+    # 2) y 3) MSD de cada corrida promediada sobre orígenes de tiempo, en un retículo uniforme hasta el tiempo
+    # máximo común, guardada en MSD_CACHE para dcm_error.py
+    t_common, msd_runs = cached_msd(files, PARTICLE_INDEX, PARTICLE_RADIUS, N_SAMPLES, OVERSAMPLE, MSD_CACHE)
+    t_max = t_common[-1]
 
     # 4) Promedio y desviación estándar
     msd_mean = msd_runs.mean(axis=0)
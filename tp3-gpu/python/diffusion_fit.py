@@ -0,0 +1,48 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+def fit_diffusion(t, msd):
+    """
+    D que minimiza E(D) = Σ_i [MSD(t_i) - 4 D t_i]², en forma cerrada: D = Σ MSD(t_i) t_i / (4 Σ t_i²). msd puede
+    tener forma (..., len(t)) para ajustar varias curvas a la vez.
+    """
+    t = np.asarray(t, dtype=np.float64)
+    return np.asarray(msd, dtype=np.float64) @ t / (4 * (t @ t))
+
+
+def error_curve(t, msd, D_vals):
+    """Evalúa E(D) = Σ_i [MSD(t_i) - 4 D t_i]² para todos los D de D_vals a la vez."""
+    t = np.asarray(t, dtype=np.float64)
+    D_vals = np.asarray(D_vals, dtype=np.float64)
+    return np.sum((np.asarray(msd)[None, :] - 4 * D_vals[:, None] * t[None, :]) ** 2, axis=1)
+
+
+def _bootstrap_chunk(t, msd_runs, n_boot, seed):
+    rng = np.random.default_rng(seed)
+    indices = rng.integers(0, len(msd_runs), size=(n_boot, len(msd_runs)))
+    return fit_diffusion(t, msd_runs[indices].mean(axis=1))
+
+
+def bootstrap_diffusion(t, msd_runs, n_boot=1000, confidence=0.95, seed=None, max_workers=None):
+    """
+    Intervalo de confianza de D remuestreando las corridas con reposición: cada muestra promedia la MSD de R corridas
+    elegidas al azar y se ajusta con fit_diffusion. Las muestras se reparten en bloques entre un pool de procesos,
+    cada uno con su propia semilla derivada de seed. Devuelve (D_inf, D_sup, muestras).
+
+    Los scripts que lo llamen tienen que hacerlo bajo if __name__ == "__main__", porque los procesos los importan.
+    """
+    workers = max_workers or os.cpu_count() or 1
+    tamanios = [len(bloque) for bloque in np.array_split(np.arange(n_boot), workers) if len(bloque) != 0]
+    semillas = np.random.SeedSequence(seed).spawn(len(tamanios))
+
+    msd_runs = np.asarray(msd_runs, dtype=np.float64)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        bloques = executor.map(_bootstrap_chunk, [t] * len(tamanios), [msd_runs] * len(tamanios), tamanios, semillas)
+        muestras = np.concatenate(list(bloques))
+
+    alfa = (1 - confidence) / 2
+    D_inf, D_sup = np.quantile(muestras, [alfa, 1 - alfa])
+    return D_inf, D_sup, muestras
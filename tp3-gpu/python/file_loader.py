@@ -1,5 +1,44 @@
+import os
 import struct
 
+import numpy as np
+
+# Columnas de cada partícula en state, para proyectar con SimulationData.select
+POSITION = slice(0, 2)
+VELOCITY = slice(2, 4)
+
+
+def step_dtype(N):
+    """
+    Tipo de registro de un paso del archivo .sim (ver file_format.txt):
+    (int step, float time, N * (posX, posY, velX, velY)).
+    """
+    return np.dtype([('step', '<u4'), ('time', '<f4'), ('state', '<f4', (N, 4))])
+
+
+# Valores de partner en el archivo de eventos; los demás son el índice de la otra partícula
+PARTNER_PARED = -1
+PARTNER_OBSTACULO = 0
+
+
+def event_dtype():
+    """
+    Tipo de registro de un choque del archivo de eventos (ver file_format.txt): (int step, float time, int particle,
+    int partner, posición, velocidad previa y velocidad posterior).
+    """
+    return np.dtype([
+        ('step', '<u4'), ('time', '<f4'), ('particle', '<u4'), ('partner', '<i4'),
+        ('position', '<f4', (2,)), ('vel_pre', '<f4', (2,)), ('vel_post', '<f4', (2,)),
+    ])
+
+
+def _read_header(f):
+    """Lee el encabezado común a los archivos .sim y de eventos y devuelve (radio_contenedor, N, masas, radios)."""
+    radio_contenedor, N = struct.unpack('<fI', f.read(8))
+    consts = np.frombuffer(f.read(8 * N), dtype='<f4').reshape(N, 2)
+    return radio_contenedor, N, consts[:, 0], consts[:, 1]
+
+
 class SimulationStepData:
     def __init__(self, step_number, time, particles_data):
         self.step_number = step_number
@@ -12,38 +51,189 @@ class SimulationStepData:
     def velocity_of(self, i):
         return (self.particles_data[i][2], self.particles_data[i][3])
 
+
+class MappedStepsData:
+    """
+    Secuencia de SimulationStepData construidos a demanda sobre los arrays mapeados, para que el código que recorre
+    steps_data siga funcionando sin materializar todos los pasos.
+    """
+    def __init__(self, simulation):
+        self._simulation = simulation
+
+    def __len__(self):
+        return len(self._simulation.times)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        sim = self._simulation
+        return SimulationStepData(int(sim.steps[index]), float(sim.times[index]), sim.state[index])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
 class SimulationData:
-    def __init__(self, path):
+    """
+    Carga un archivo .sim en arrays: steps y times de forma (T,), state de forma (T, N, 4) y positions y velocities,
+    vistas (T, N, 2) sobre state. Con mmap=True el archivo se mapea a memoria en lugar de leerse, sin copias.
+    """
+    def __init__(self, path, mmap=False):
         self.path = path
         self.radio_contenedor = None
         self.N = None
         self.masas = None
         self.radios = None
         self.steps_data = None
-        self._load_data()
-        print(f"Cargado archivo {path} con {self.N} particulas, {len(self.steps_data)} pasos y duración {self.steps_data[-1].time}")
+        self.records = None
+        self.steps = None
+        self.times = None
+        self.state = None
+        self.positions = None
+        self.velocities = None
+        self.header_size = None
+        if mmap:
+            self._map_data()
+        else:
+            self._load_data()
+        duracion = self.steps_data[-1].time if len(self.steps_data) != 0 else 0.0
+        print(f"Cargado archivo {path} con {self.N} particulas, {len(self.steps_data)} pasos y duración {duracion}")
+
+    def _read_header(self, f):
+        self.radio_contenedor, self.N, self.masas, self.radios = _read_header(f)
+        self.header_size = 8 + 8 * self.N
+        return self.header_size
+
+    def _set_records(self, records):
+        self.records = records
+        self.steps = records['step']
+        self.times = records['time']
+        self.state = records['state']
+        self.positions = self.state[:, :, 0:2]
+        self.velocities = self.state[:, :, 2:4]
+        self.steps_data = MappedStepsData(self)
 
     def _load_data(self):
         with open(self.path, 'rb') as f:
-            self.radio_contenedor = struct.unpack('f', f.read(4))[0]
-            self.N = struct.unpack('i', f.read(4))[0]
+            self._read_header(f)
+            data = f.read()
 
-            self.masas = []
-            self.radios = []
-            for _ in range(self.N):
-                tmp = struct.unpack('ff', f.read(8))
-                self.masas.append(tmp[0])
-                self.radios.append(tmp[1])
+        # Los pasos incompletos al final del archivo (simulación cortada) se ignoran
+        dtype = step_dtype(self.N)
+        self._set_records(np.frombuffer(data, dtype=dtype, count=len(data) // dtype.itemsize))
 
-            self.steps_data = []
+    def _map_data(self):
+        with open(self.path, 'rb') as f:
+            header_size = self._read_header(f)
+
+        # Los pasos incompletos al final del archivo (simulación cortada) se ignoran
+        dtype = step_dtype(self.N)
+        count = (os.path.getsize(self.path) - header_size) // dtype.itemsize
+        if count > 0:
+            self._set_records(np.memmap(self.path, dtype=dtype, mode='r', offset=header_size, shape=(count,)))
+        else:
+            self._set_records(np.zeros(0, dtype=dtype))
+
+    def select(self, particles=None, columns=None):
+        """
+        Devuelve una copia contigua float32 de state restringida a las partículas y columnas pedidas, por ejemplo
+        select(particles=[0], columns=POSITION) da un array (T, 1, 2). Con mmap=True solo se leen esos bytes.
+        """
+        state = self.state
+        if particles is not None:
+            state = state[:, particles]
+        if columns is not None:
+            state = state[..., columns]
+        return np.ascontiguousarray(state, dtype=np.float32)
+
+    def nearest_steps(self, frame_times):
+        """
+        Devuelve, para cada tiempo de frame_times (ordenados), el índice del paso de tiempo más cercano, con un único
+        np.searchsorted sobre times. Ante un empate se queda con el paso posterior, y si hay varios pasos con el mismo
+        tiempo, con el último.
+        """
+        times = np.asarray(self.times, dtype=np.float64)
+        frame_times = np.asarray(frame_times, dtype=np.float64)
+        if len(times) == 0:
+            return np.zeros(len(frame_times), dtype=np.int64)
+
+        siguiente = np.clip(np.searchsorted(times, frame_times, side='left'), 0, len(times) - 1)
+        anterior = np.maximum(siguiente - 1, 0)
+        elegido = np.where(np.abs(times[siguiente] - frame_times) <= np.abs(times[anterior] - frame_times), siguiente, anterior)
+        return np.searchsorted(times, times[elegido], side='right') - 1
+
+    def iter_blocks(self, block_size=4096):
+        """
+        Recorre el archivo en bloques de hasta block_size pasos, leídos con readinto sobre un único buffer reutilizado,
+        y devuelve tuplas (steps, times, state) con formas (K,), (K,) y (K, N, 4). Los arrays de cada bloque son vistas
+        sobre ese buffer y se sobreescriben en la siguiente iteración; hay que copiarlos si se quieren conservar.
+        """
+        dtype = step_dtype(self.N)
+        buffer = np.empty(block_size, dtype=dtype)
+        raw = buffer.view(np.uint8)
+        with open(self.path, 'rb') as f:
+            f.seek(self.header_size)
             while True:
-                step_bytes = f.read(4)
-                if not step_bytes:
+                count = f.readinto(raw) // dtype.itemsize
+                if count == 0:
+                    break
+                block = buffer[:count]
+                yield block['step'], block['time'], block['state']
+                if count < block_size:
                     break
-                step_number = struct.unpack('i', step_bytes)[0]
-                time = struct.unpack('f', f.read(4))[0]
-                particles_data = [struct.unpack('ffff', f.read(16)) for _ in range(self.N)]
-                self.steps_data.append(SimulationStepData(step_number, time, particles_data))
 
     def __str__(self):
         return f"Simulación: {self.path}"
+
+
+class EventData:
+    """
+    Carga un archivo de eventos (ver file_format.txt) en arrays de forma (E,), uno por campo de cada choque: steps,
+    times, particles, partners, positions (E, 2), vel_pre (E, 2) y vel_post (E, 2). Con mmap=True el archivo se mapea
+    a memoria en lugar de leerse.
+    """
+    def __init__(self, path, mmap=False):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.radio_contenedor, self.N, self.masas, self.radios = _read_header(f)
+            self.header_size = 8 + 8 * self.N
+            data = None if mmap else f.read()
+
+        # Los registros incompletos al final del archivo (simulación cortada) se ignoran
+        dtype = event_dtype()
+        if mmap:
+            count = (os.path.getsize(path) - self.header_size) // dtype.itemsize
+            if count > 0:
+                records = np.memmap(path, dtype=dtype, mode='r', offset=self.header_size, shape=(count,))
+            else:
+                records = np.zeros(0, dtype=dtype)
+        else:
+            records = np.frombuffer(data, dtype=dtype, count=len(data) // dtype.itemsize)
+
+        self.records = records
+        self.steps = records['step']
+        self.times = records['time']
+        self.particles = records['particle']
+        self.partners = records['partner']
+        self.positions = records['position']
+        self.vel_pre = records['vel_pre']
+        self.vel_post = records['vel_post']
+        duracion = self.times[-1] if len(self.times) != 0 else 0.0
+        print(f"Cargado archivo de eventos {path} con {self.N} particulas, {len(self.times)} choques y duración {duracion}")
+
+    def wall_hits(self):
+        """Máscara (E,) de los choques de una partícula contra la pared."""
+        return self.partners == PARTNER_PARED
+
+    def obstacle_hits(self):
+        """Máscara (E,) de los choques de una partícula contra el obstáculo, sin contar el registro del obstáculo."""
+        return (self.partners == PARTNER_OBSTACULO) & (self.particles != PARTNER_OBSTACULO)
+
+    def impulses(self):
+        """Impulso m * |v_post - v_pre| que transfiere cada choque, de forma (E,)."""
+        delta = self.vel_post.astype(np.float64) - self.vel_pre
+        return self.masas[self.particles] * np.hypot(delta[:, 0], delta[:, 1])
+
+    def __str__(self):
+        return f"Eventos: {self.path}"
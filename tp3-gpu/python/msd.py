@@ -0,0 +1,142 @@
+import os
+
+import numpy as np
+
+from file_loader import SimulationData, POSITION
+
+
+def cut_at_border(times, pos, radio_contenedor, radio_particula):
+    """
+    Recorta la trayectoria (times, pos) justo antes del primer paso en que la partícula toca el borde del recinto,
+    es decir |pos| >= radio_contenedor - radio_particula. Si nunca lo toca la devuelve completa.
+    """
+    d = np.hypot(pos[:, 0], pos[:, 1])
+    choques = np.flatnonzero(d >= radio_contenedor - radio_particula)
+    if choques.size > 0:
+        return times[:choques[0]], pos[:choques[0]]
+    return times, pos
+
+
+def load_runs(paths, particle_index, radio_particula):
+    """
+    Lee la trayectoria de una partícula de cada .sim, recortada al primer choque con el borde, y devuelve una lista
+    de (times, pos) con las corridas que conservan más de un paso.
+    """
+    runs = []
+    for path in paths:
+        sim = SimulationData(path, mmap=True)
+        pos = np.asarray(sim.select(particles=particle_index, columns=POSITION), dtype=float)
+        t, pos = cut_at_border(np.asarray(sim.times, dtype=float), pos, sim.radio_contenedor, radio_particula)
+        if t.size > 1:
+            runs.append((t, pos))
+    return runs
+
+
+def resample_runs(runs, dt):
+    """
+    Lleva cada corrida a un retículo uniforme 0, dt, 2 dt, ... hasta su último tiempo. Entre pasos las partículas
+    se mueven en línea recta, así que interpolar linealmente da la posición exacta. Devuelve (positions, lengths):
+    un array (R, L, 2) relleno con ceros después del final de cada corrida y la cantidad de puntos de cada una.
+    """
+    lengths = np.array([int(np.floor(t[-1] / dt + 1e-9)) + 1 for t, _ in runs], dtype=np.int64)
+    positions = np.zeros((len(runs), lengths.max() if len(runs) else 0, 2))
+    for r, (t, pos) in enumerate(runs):
+        grid = np.arange(lengths[r]) * dt
+        positions[r, :lengths[r], 0] = np.interp(grid, t, pos[:, 0])
+        positions[r, :lengths[r], 1] = np.interp(grid, t, pos[:, 1])
+    return positions, lengths
+
+
+def msd_fft(positions, lengths):
+    """
+    MSD promediado sobre todos los orígenes de tiempo de cada corrida, para todos los retrasos a la vez:
+        MSD_r(m) = 1 / (n_r - m) * Σ_k |x_r(k + m) - x_r(k)|²
+    Se separa en Σ x(k)² + x(k+m)², que sale de sumas acumuladas, menos 2 Σ x(k)·x(k+m), la autocorrelación, que se
+    calcula con FFT para todas las corridas juntas en O(L log L). Recibe lo que devuelve resample_runs y devuelve un
+    array (R, L) con NaN en los retrasos m >= n_r.
+    """
+    R, L, _ = positions.shape
+    if L == 0:
+        return np.zeros((R, 0))
+
+    # La MSD no cambia al trasladar la trayectoria; centrarla mejora la precisión de las restas
+    validos = np.arange(L)[None, :] < lengths[:, None]
+    x = np.where(validos[..., None], positions - positions[:, :1], 0.0)
+
+    # Autocorrelación: con relleno a 2L la FFT no mezcla el final de la corrida con su principio
+    espectro = np.fft.rfft(x, n=2 * L, axis=1)
+    autocorr = np.fft.irfft(np.abs(espectro) ** 2, n=2 * L, axis=1)[:, :L].sum(axis=2)
+
+    cuadrados = np.sum(x ** 2, axis=2)
+    acumulados = np.concatenate([np.zeros((R, 1)), np.cumsum(cuadrados, axis=1)], axis=1)
+    total = acumulados[np.arange(R), lengths][:, None]
+    m = np.arange(L)[None, :]
+    restantes = lengths[:, None] - m
+    # Σ_{k<n-m} x(k)² = acumulados[n-m] y Σ_{k<n-m} x(k+m)² = total - acumulados[m]
+    primeros = np.take_along_axis(acumulados, np.clip(restantes, 0, L), axis=1)
+    sumas_cuadrados = primeros + total - np.take_along_axis(acumulados, np.broadcast_to(m, (R, L)), axis=1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        msd = (sumas_cuadrados - 2 * autocorr) / restantes
+    return np.where(restantes > 0, np.maximum(msd, 0.0), np.nan)
+
+
+def time_averaged_msd(runs, n_samples, oversample=1):
+    """
+    Calcula la MSD de cada corrida promediada sobre orígenes de tiempo, en n_samples retrasos uniformes entre 0 y el
+    final de la corrida más corta. El retículo de orígenes es oversample veces más fino que el de los retrasos.
+    Devuelve (t_common, msd_runs) con msd_runs de forma (R, n_samples).
+    """
+    t_max = min(t[-1] for t, _ in runs)
+    t_common = np.linspace(0, t_max, n_samples)
+    paso = t_max / (n_samples - 1) / oversample
+
+    positions, lengths = resample_runs(runs, paso)
+    msd = msd_fft(positions, lengths)
+    return t_common, msd[:, :(n_samples - 1) * oversample + 1:oversample]
+
+
+def _source_key(paths, particle_index, radio_particula, n_samples, oversample):
+    stats = [os.stat(path) for path in paths]
+    return (
+        np.array([os.path.abspath(path) for path in paths], dtype=str),
+        np.array([[stat.st_size, stat.st_mtime_ns] for stat in stats], dtype=np.int64).reshape(len(paths), 2),
+        np.array([particle_index, n_samples, oversample, radio_particula], dtype=np.float64),
+    )
+
+
+def _read_cache(cache_path, key):
+    if not os.path.exists(cache_path):
+        return None
+    with np.load(cache_path) as cache:
+        if any(not np.array_equal(cache[name], value) for name, value in zip(('paths', 'stats', 'params'), key)):
+            return None
+        return cache['t_common'], cache['msd_runs']
+
+
+def _write_cache(cache_path, key, t_common, msd_runs):
+    try:
+        np.savez(cache_path, paths=key[0], stats=key[1], params=key[2], t_common=t_common, msd_runs=msd_runs)
+    except OSError as e:
+        print(f"No se pudo guardar la MSD en {cache_path}: {e}")
+
+
+def cached_msd(paths, particle_index, radio_particula, n_samples, oversample=1, cache_path=None):
+    """
+    time_averaged_msd de las corridas de load_runs, guardada en cache_path (un .npz) y reutilizada mientras no
+    cambien los archivos, su tamaño y fecha de modificación, ni los parámetros. Así dcm.py y dcm_error.py leen los
+    .sim una sola vez. Sin cache_path no se guarda nada. Devuelve (t_common, msd_runs).
+    """
+    key = _source_key(paths, particle_index, radio_particula, n_samples, oversample)
+    if cache_path is not None:
+        cached = _read_cache(cache_path, key)
+        if cached is not None:
+            return cached
+
+    runs = load_runs(paths, particle_index, radio_particula)
+    if not runs:
+        raise RuntimeError("Tras recortar bordes no quedan datos válidos.")
+    t_common, msd_runs = time_averaged_msd(runs, n_samples, oversample)
+    if cache_path is not None:
+        _write_cache(cache_path, key, t_common, msd_runs)
+    return t_common, msd_runs
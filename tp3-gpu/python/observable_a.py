@@ -1,8 +1,11 @@
-import os, struct, re
+import os, re
 import numpy as np
 import matplotlib.pyplot as plt
 from collections import defaultdict
 
+from file_loader import SimulationData
+from collisions import obstacle_collisions
+
 # === CONFIG ===
 R_obst = 0.005
 tol_factor = 0.00001
@@ -11,38 +14,8 @@ pattern = r"output\d+-fixedobstacle-250particles-vel(\d+)-50ksteps.sim"
 
 # === FUNCIONES ===
 def read_tfirst(simfile):
-    data = open(simfile, "rb").read()
-    offset = 4
-    N = struct.unpack_from("I", data, offset)[0]; offset += 4
-    radii = np.empty(N, dtype=np.float32)
-    for i in range(N):
-        _, r = struct.unpack_from("ff", data, offset)
-        radii[i] = r
-        offset += 8
-
-    hit_first = np.zeros(N, bool)
-    times_first = np.full(N, np.nan, dtype=np.float32)
-
-    while offset + 8 + 16*N <= len(data):
-        _, t = struct.unpack_from("If", data, offset)
-        offset += 8
-        pos = np.empty((N,2), dtype=np.float32)
-        for i in range(N):
-            x,y,_,_ = struct.unpack_from("ffff", data, offset)
-            pos[i] = (x,y)
-            offset += 16
-
-        dist = np.hypot(pos[:,0], pos[:,1])
-        sum_r = R_obst + radii
-        tol = tol_factor * sum_r
-        collided = np.abs(dist - sum_r) < tol
-        idx = np.nonzero(collided)[0]
-        for i in idx:
-            if not hit_first[i]:
-                hit_first[i] = True
-                times_first[i] = t
-
-    return times_first[~np.isnan(times_first)]
+    sim = SimulationData(simfile, mmap=True)
+    return obstacle_collisions(sim, R_obst, tol_factor).hit_first_times
 
 # === AGRUPAR ARCHIVOS ===
 files_by_vel = defaultdict(list)
@@ -1,8 +1,11 @@
-import os, struct, re
+import os, re
 import numpy as np
 import matplotlib.pyplot as plt
 from collections import defaultdict
 
+from file_loader import SimulationData
+from collisions import obstacle_collisions
+
 # === CONFIGURACIÓN ===
 R_obst = 0.005
 tol_factor = 0.00001
@@ -11,37 +14,10 @@ pattern = r"output\d+-fixedobstacle-250particles-vel(\d+)-50ksteps.sim"
 
 # === PARSER .sim ===
 def read_collisions(simfile):
-    data = open(simfile, "rb").read()
-    offset = 4
-    N = struct.unpack_from("I", data, offset)[0]; offset += 4
-    radii = np.empty(N, dtype=np.float32)
-    for i in range(N):
-        _, r = struct.unpack_from("ff", data, offset)
-        radii[i] = r
-        offset += 8
-
-    times_all = []
-    t_final = 0.0
-
-    while offset + 8 + 16*N <= len(data):
-        _, t = struct.unpack_from("If", data, offset)
-        offset += 8
-        pos = np.empty((N,2), dtype=np.float32)
-        for i in range(N):
-            x,y,_,_ = struct.unpack_from("ffff", data, offset)
-            pos[i] = (x,y)
-            offset += 16
-        t_final = t
-
-        dist = np.hypot(pos[:,0], pos[:,1])
-        sum_r = R_obst + radii
-        tol = tol_factor * sum_r
-        collided = np.abs(dist - sum_r) < tol
-        idx = np.nonzero(collided)[0]
-        for i in idx:
-            times_all.append(t)
+    sim = SimulationData(simfile, mmap=True)
+    choques = obstacle_collisions(sim, R_obst, tol_factor)
 
-    ν_all = len(times_all) / t_final
+    ν_all = choques.counts.sum() / choques.t_final
     return ν_all
 
 # === AGRUPAR ARCHIVOS POR VELOCIDAD ===
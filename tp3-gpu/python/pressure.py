@@ -0,0 +1,137 @@
+import numpy as np
+
+RADIO_OBSTACULO = 0.005
+
+
+def collision_impulses(positions, velocities, masas, radios, radio_contenedor, radio_obstaculo=RADIO_OBSTACULO):
+    """
+    Detecta los rebotes contra la pared y contra el obstáculo entre pasos consecutivos, buscando partículas cuya
+    velocidad cambió de signo en alguna componente y que están a menos de 2 radios del borde correspondiente.
+
+    Recibe positions y velocities de forma (T, N, 2) y devuelve dos arrays de forma (T - 1,) con el impulso 2*m*|v_n|
+    transferido a la pared y al obstáculo en cada paso 1..T-1.
+    """
+    masas = np.asarray(masas, dtype=np.float32)
+    radios = np.asarray(radios, dtype=np.float32)
+
+    vel_prev = velocities[:-1]
+    vel = velocities[1:]
+    pos = positions[1:]
+
+    rebote = np.any(np.sign(vel_prev) != np.sign(vel), axis=2)
+    dist = np.hypot(pos[..., 0], pos[..., 1])
+    contra_pared = rebote & (np.abs(dist - radio_contenedor) < 2 * radios)
+    contra_obstaculo = rebote & ~contra_pared & (np.abs(dist - radio_obstaculo) < 2 * radios)
+
+    # Componente normal de la velocidad previa al choque
+    with np.errstate(divide='ignore', invalid='ignore'):
+        v_normal = np.abs(np.sum(vel_prev * pos, axis=2) / dist)
+    impulso = 2 * masas * v_normal
+
+    impulso_pared = np.where(contra_pared, impulso, 0).sum(axis=1, dtype=np.float64)
+    impulso_obstaculo = np.where(contra_obstaculo, impulso, 0).sum(axis=1, dtype=np.float64)
+    return impulso_pared, impulso_obstaculo
+
+
+def _window_pressures(sumas, ultimo_tiempo, ventana, perimetro, ventana_parcial=False):
+    """
+    Convierte sumas de impulso por ventana de tiempo [k * ventana, (k + 1) * ventana) en (tiempos, presiones), con
+    tiempos en el centro de cada ventana. Solo se incluyen las ventanas completas hasta ultimo_tiempo, salvo que
+    ventana_parcial sea True.
+    """
+    cantidad = int(np.floor(ultimo_tiempo / ventana))
+    if ventana_parcial and cantidad > 0:
+        cantidad = int(np.ceil(ultimo_tiempo / ventana))
+
+    completas = np.zeros(cantidad)
+    hasta = min(cantidad, len(sumas))
+    completas[:hasta] = sumas[:hasta]
+    tiempos = (np.arange(cantidad) + 0.5) * ventana
+    return tiempos, completas / (ventana * perimetro)
+
+
+class PressureAccumulator:
+    """
+    Versión incremental de pressure para recorrer una simulación por bloques (ver SimulationData.iter_blocks). Guarda
+    el último paso de cada bloque para detectar los rebotes en el borde con el bloque siguiente, y las
+    sumas de impulso por ventana, así que las ventanas que cruzan bloques se acumulan bien.
+    """
+    def __init__(self, sim, ventana, radio_obstaculo=RADIO_OBSTACULO):
+        self.ventana = ventana
+        self.radio_obstaculo = radio_obstaculo
+        self.radio_contenedor = sim.radio_contenedor
+        self.masas = sim.masas
+        self.radios = sim.radios
+        self._ultimo_paso = None
+        self._ultimo_tiempo = None
+        self._sumas_pared = np.zeros(0)
+        self._sumas_obstaculo = np.zeros(0)
+
+    @staticmethod
+    def _acumular(sumas, indices, impulsos):
+        nuevas = np.bincount(indices, weights=impulsos)
+        if len(nuevas) > len(sumas):
+            sumas = np.concatenate([sumas, np.zeros(len(nuevas) - len(sumas))])
+        sumas[:len(nuevas)] += nuevas
+        return sumas
+
+    def add_block(self, times, state):
+        if len(times) == 0:
+            return
+        if self._ultimo_paso is not None:
+            times = np.concatenate([[self._ultimo_tiempo], times])
+            state = np.concatenate([self._ultimo_paso[None], state])
+
+        impulso_pared, impulso_obstaculo = collision_impulses(
+            state[..., 0:2], state[..., 2:4], self.masas, self.radios, self.radio_contenedor, self.radio_obstaculo
+        )
+        indices = np.floor(np.asarray(times[1:], dtype=np.float64) / self.ventana).astype(np.int64)
+        self._sumas_pared = self._acumular(self._sumas_pared, indices, impulso_pared)
+        self._sumas_obstaculo = self._acumular(self._sumas_obstaculo, indices, impulso_obstaculo)
+
+        self._ultimo_paso = np.array(state[-1])
+        self._ultimo_tiempo = float(times[-1])
+
+    def result(self, ventana_parcial=False):
+        """Devuelve (tiempos, presion_pared, presion_obstaculo) con lo acumulado hasta ahora."""
+        if self._ultimo_tiempo is None:
+            return np.zeros(0), np.zeros(0), np.zeros(0)
+
+        tiempos, presion_pared = _window_pressures(
+            self._sumas_pared, self._ultimo_tiempo, self.ventana, 2 * np.pi * self.radio_contenedor, ventana_parcial
+        )
+        _, presion_obstaculo = _window_pressures(
+            self._sumas_obstaculo, self._ultimo_tiempo, self.ventana, 2 * np.pi * self.radio_obstaculo, ventana_parcial
+        )
+        return tiempos, presion_pared, presion_obstaculo
+
+
+def pressure(sim, ventana, radio_obstaculo=RADIO_OBSTACULO, ventana_parcial=False, block_size=4096):
+    """
+    Calcula la presión sobre la pared y sobre el obstáculo de una SimulationData por ventanas de tiempo, recorriendo
+    el archivo por bloques de block_size pasos con memoria acotada. Devuelve (tiempos, presion_pared,
+    presion_obstaculo).
+    """
+    acumulador = PressureAccumulator(sim, ventana, radio_obstaculo)
+    for _, times, state in sim.iter_blocks(block_size):
+        acumulador.add_block(times, state)
+    return acumulador.result(ventana_parcial)
+
+
+def event_pressure(events, ventana, radio_obstaculo=RADIO_OBSTACULO, ventana_parcial=False, t_final=None):
+    """
+    Calcula la presión sobre la pared y sobre el obstáculo a partir de un EventData, sumando el impulso exacto de cada
+    choque registrado en lugar de detectar los rebotes entre pasos. t_final es la duración de la simulación (por
+    defecto, el tiempo del último choque). Devuelve (tiempos, presion_pared, presion_obstaculo), como pressure.
+    """
+    ultimo_tiempo = t_final if t_final is not None else (float(events.times[-1]) if len(events.times) != 0 else 0.0)
+    impulsos = events.impulses()
+    indices = np.floor(np.asarray(events.times, dtype=np.float64) / ventana).astype(np.int64)
+
+    def presiones(mascara, perimetro):
+        sumas = np.bincount(indices[mascara], weights=impulsos[mascara])
+        return _window_pressures(sumas, ultimo_tiempo, ventana, perimetro, ventana_parcial)
+
+    tiempos, presion_pared = presiones(events.wall_hits(), 2 * np.pi * events.radio_contenedor)
+    _, presion_obstaculo = presiones(events.obstacle_hits(), 2 * np.pi * radio_obstaculo)
+    return tiempos, presion_pared, presion_obstaculo
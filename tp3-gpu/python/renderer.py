@@ -0,0 +1,36 @@
+# La misma clase que tp4/python/renderer.py y tp5/python/renderer.py, con los nombres en español: los cambios se
+# hacen en las tres.
+
+import numpy as np
+from matplotlib.collections import EllipseCollection
+
+
+class ParticleRenderer:
+    """
+    Dibuja todas las partículas con un único EllipseCollection en lugar de un Circle por partícula. Los radios están
+    en unidades de los datos, y cada fotograma solo cambia las posiciones con set_offsets, así que el blit redibuja un
+    solo artista. Con ancho_borde mayor a 0 cada partícula tiene un borde de ese ancho (en puntos) de su mismo color,
+    como un Circle creado con color=.
+    """
+    def __init__(self, ax, radios, colores='white', alpha=1.0, ancho_borde=0, zorder=2):
+        radios = np.atleast_1d(np.asarray(radios, dtype=float))
+        self.collection = EllipseCollection(
+            widths=2 * radios, heights=2 * radios, angles=0, units='xy',
+            offsets=np.zeros((len(radios), 2)), offset_transform=ax.transData,
+            facecolors=colores, edgecolors='face' if ancho_borde > 0 else 'none', linewidths=ancho_borde, alpha=alpha, zorder=zorder,
+        )
+        ax.add_collection(self.collection)
+
+    def update(self, posiciones, colores=None, radios=None):
+        """
+        Mueve las partículas a posiciones, un array (N, 2). N puede cambiar entre fotogramas; en ese caso hay que
+        pasar colores y radios por partícula si no son todos iguales. Devuelve la lista de artistas para el blit.
+        """
+        self.collection.set_offsets(np.asarray(posiciones)[:, 0:2])
+        if colores is not None:
+            self.collection.set_facecolor(colores)
+        if radios is not None:
+            radios = np.atleast_1d(np.asarray(radios, dtype=float))
+            self.collection.set_widths(2 * radios)
+            self.collection.set_heights(2 * radios)
+        return [self.collection]
@@ -7,39 +7,7 @@ import os
 
 from matplotlib import ticker
 
-
-class ParticleState:
-    def __init__(self, pos, vel):
-        self.position = pos
-        self.velocity = vel
-
-class SimulationStep:
-    def __init__(self, step, time, particles):
-        self.step = step
-        self.time = time
-        self.particles = particles
-
-def parse_simulation_file(file_path):
-    with open(file_path, 'r') as file:
-        lines = [line.strip() for line in file if line.strip()]
-    steps = []
-    for line in lines[3:]:
-        match = re.match(r'\[(\d+)\s+([\d.eE+-]+)\]\s+(.*)', line)
-        if not match:
-            continue
-        step = int(match.group(1))
-        time = float(match.group(2))
-        particles_raw = match.group(3).split(';')
-        particles = []
-        for pdata in particles_raw:
-            values = list(map(float, pdata.strip().split()))
-            if len(values) != 4:
-                continue
-            pos = (values[0], values[1])
-            vel = (values[2], values[3])
-            particles.append(ParticleState(pos, vel))
-        steps.append(SimulationStep(step, time, particles))
-    return steps
+from file_loader import parse_simulation_file
 
 # === CAMBIÁ ESTA RUTA POR TU ARCHIVO ===
 file_path = "../bin/Debug/net8.0/k=1e4/complex-k1e4-w19.txt"
@@ -54,18 +22,18 @@ k_str = k_match.group(1) if k_match else "UNKNOWN"
 omega_value = float(omega_str) if omega_str != "UNKNOWN" else None
 
 # === PARSEAR Y PROCESAR ===
-steps = parse_simulation_file(file_path)
-times = [step.time for step in steps]
-amplitudes = [max(abs(p.position[1]) for p in step.particles) for step in steps]
+sim = parse_simulation_file(file_path)
+times = sim.times
+amplitudes = np.abs(sim.state[:, :, 1]).max(axis=1)
 
 # Recortar primeros pasos (fase transitoria)
-cut_low = int(len(steps) * 0)
-steps_cut = steps[cut_low:]
+cut_low = int(len(times) * 0)
+times_cut = times[cut_low:]
+amps_cut = amplitudes[cut_low:]
 
 # Tomar último 30% para cálculo de amplitud máxima
-cut_high = int(len(steps_cut) * 0.7)
-final_segment = steps_cut[cut_high:]
-max_amplitud_final = max(max(abs(p.position[1]) for p in step.particles) for step in final_segment)
+cut_high = int(len(times_cut) * 0.7)
+max_amplitud_final = amps_cut[cut_high:].max()
 
 omega_formatted = f"{omega_value:.2f}" if omega_value is not None else "UNKNOWN"
 
@@ -81,9 +49,6 @@ with open(output_filename, "w") as f:
 print(f"Amplitud máxima guardada en: {output_filename}")
 
 # === GRAFICAR (opcional, para revisar) ===
-times_cut = [step.time for step in steps_cut]
-amps_cut = [max(abs(p.position[1]) for p in step.particles) for step in steps_cut]
-
 plt.figure(figsize=(10, 6))
 plt.plot(times_cut, amps_cut)
 plt.axhline(max_amplitud_final, color="red", linestyle="--", label="Amplitud máxima en estado estacionario")
@@ -2,39 +2,7 @@ import os
 import re
 import numpy as np
 
-# Reutilizamos la lógica de parseo
-class ParticleState:
-    def __init__(self, pos, vel):
-        self.position = pos
-        self.velocity = vel
-
-class SimulationStep:
-    def __init__(self, step, time, particles):
-        self.step = step
-        self.time = time
-        self.particles = particles
-
-def parse_simulation_file(file_path):
-    with open(file_path, 'r') as file:
-        lines = [line.strip() for line in file if line.strip()]
-    steps = []
-    for line in lines[3:]:
-        match = re.match(r'\[(\d+)\s+([\d.eE+-]+)\]\s+(.*)', line)
-        if not match:
-            continue
-        step = int(match.group(1))
-        time = float(match.group(2))
-        particles_raw = match.group(3).split(';')
-        particles = []
-        for pdata in particles_raw:
-            values = list(map(float, pdata.strip().split()))
-            if len(values) != 4:
-                continue
-            pos = (values[0], values[1])
-            vel = (values[2], values[3])
-            particles.append(ParticleState(pos, vel))
-        steps.append(SimulationStep(step, time, particles))
-    return steps
+from file_loader import parse_simulation_file
 
 # === Parámetros de entrada ===
 k_target = "1e3"  # <- cambiar por el k que quieras
@@ -61,16 +29,14 @@ for fname in sim_files:
     omega_formatted = f"{omega_value:.2f}"  # Formateamos omega con 2 decimales
 
     # Parsear y procesar
-    steps = parse_simulation_file(file_path)
+    sim = parse_simulation_file(file_path)
+    amplitudes = np.abs(sim.state[:, :, 1]).max(axis=1)
 
-    cut_low = int(len(steps) * 0.1)
-    steps_cut = steps[cut_low:]
-    cut_high = int(len(steps_cut) * 0.7)  ##0.7 => usamos 30% final
-    final_segment = steps_cut[cut_high:]
+    cut_low = int(len(amplitudes) * 0.1)
+    amps_cut = amplitudes[cut_low:]
+    cut_high = int(len(amps_cut) * 0.7)  ##0.7 => usamos 30% final
 
-    max_amplitud_final = max(
-        max(abs(p.position[1]) for p in step.particles) for step in final_segment
-    )
+    max_amplitud_final = amps_cut[cut_high:].max()
 
     output_filename = os.path.join(output_dir, f"amplitud-w{omega_formatted}-k{k_target}.csv")
     with open(output_filename, "w") as f:
@@ -1,7 +1,8 @@
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
-from matplotlib.patches import Circle
 from file_loader import parse_simulation_file
+from comparison import position_bounds
+from renderer import ParticleRenderer
 
 # === Configuration ===
 FILE_PATH = "../bin/Debug/net8.0/complex-N1000-verlet-5000steps.txt"
@@ -9,8 +10,7 @@ PARTICLE_RADIUS = 0.0005  # Adjust as needed
 
 # === Load simulation data ===
 sim_data = parse_simulation_file(FILE_PATH)
-num_particles = len(sim_data.steps[0].particles)
-num_frames = len(sim_data.steps)
+num_frames = len(sim_data.times)
 
 # === Setup figure ===
 fig, ax = plt.subplots()
@@ -21,32 +21,18 @@ ax.set_xlabel("X")
 ax.set_ylabel("Y")
 
 # Determine bounds from all positions to set plot limits
-all_positions = [
-    (p.position[0], p.position[1])
-    for step in sim_data.steps
-    for p in step.particles
-]
-xs, ys = zip(*all_positions)
-padding = PARTICLE_RADIUS * 2
-ax.set_xlim(min(xs) - padding, max(xs) + padding)
-ax.set_ylim(min(ys) - padding, max(ys) + padding)
+xmin, xmax, ymin, ymax = position_bounds(sim_data, padding=PARTICLE_RADIUS * 2)
+ax.set_xlim(xmin, xmax)
+ax.set_ylim(ymin, ymax)
 
-# === Create circle objects for each particle ===
-circles = [
-    Circle((0, 0), PARTICLE_RADIUS, fc='blue', alpha=0.6)
-    for _ in range(num_particles)
-]
-for circle in circles:
-    ax.add_patch(circle)
+# === Draw all the particles with a single artist ===
+particles = ParticleRenderer(ax, PARTICLE_RADIUS, colors='blue', alpha=0.6)
 
 # === Animation update function ===
 def update(frame):
-    step = sim_data.steps[frame]
-    for i, particle in enumerate(step.particles):
-        x, y = particle.position
-        circles[i].center = (x, y)
-    ax.set_title(f"Time: {step.time:.3f}s")
-    return circles
+    artists = particles.update(sim_data.state[frame])
+    ax.set_title(f"Time: {sim_data.times[frame]:.3f}s")
+    return artists
 
 # === Animate ===
 ani = animation.FuncAnimation(
@@ -1,7 +1,10 @@
+import os
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
-from matplotlib.patches import Circle
+from comparison import common_frame_times, export_comparison, nearest_steps, position_bounds
 from file_loader import parse_simulation_file
+from renderer import ParticleRenderer
+from video import rgb
 
 # === Configuration ===
 FILE_PATHS = {
@@ -12,78 +15,77 @@ FILE_PATHS = {
 }
 PARTICLE_RADIUS = 0.1
 
-# === Load all simulations ===
-simulations = {
-    name: parse_simulation_file(path)
-    for name, path in FILE_PATHS.items()
-}
-
-# Determine number of frames from first simulation (assumed to be synced)
-num_frames = len(next(iter(simulations.values())).steps)
+# Export by rasterizing each panel in a worker process and piping raw frames to ffmpeg, instead of redrawing the
+# whole figure through matplotlib on every frame
+RAW_EXPORT = True
+EXPORT_WORKERS = os.cpu_count() or 1
 
-# === Set up the figure with one Axes per simulation ===
-fig, axes = plt.subplots(
-    nrows=2,
-    ncols=2,
-    figsize=(12, 10),
-    squeeze=False
-)
+if __name__ == "__main__":
+    # === Map all simulations ===
+    # The states are memory-mapped from the .state.npy caches, so only the steps that are drawn get read
+    simulations = {
+        name: parse_simulation_file(path, mmap=True)
+        for name, path in FILE_PATHS.items()
+    }
 
-# === Set up each subplot ===
-plots = []
-ax_list = [ax for row in axes for ax in row]  # Flatten 2D axes array
-for (name, sim_data), ax in zip(simulations.items(), ax_list):
-    num_particles = len(sim_data.steps[0].particles)
+    # The simulations may have different step counts: every panel shows its step nearest to a common time base
+    frame_times = common_frame_times(list(simulations.values()))
+    num_frames = len(frame_times)
 
-    # Get all positions to determine bounds
-    all_positions = [
-        (p.position[0], p.position[1])
-        for step in sim_data.steps
-        for p in step.particles
-    ]
-    xs, ys = zip(*all_positions)
-    padding = PARTICLE_RADIUS * 2
+    # === Set up the figure with one Axes per simulation ===
+    fig, axes = plt.subplots(
+        nrows=2,
+        ncols=2,
+        figsize=(12, 10),
+        squeeze=False
+    )
 
-    ax.set_xlim(min(xs) - padding, max(xs) + padding)
-    ax.set_ylim(min(ys) - padding, max(ys) + padding)
-    ax.set_title(name)
-    ax.set_aspect(aspect=1)
-    ax.set_xlabel("X")
-    ax.set_ylabel("Y")
+    # === Set up each subplot ===
+    plots = []
+    ax_list = [ax for row in axes for ax in row]  # Flatten 2D axes array
+    for (name, sim_data), ax in zip(simulations.items(), ax_list):
+        # Bounds from array reductions over the mapped state
+        xmin, xmax, ymin, ymax = position_bounds(sim_data, padding=PARTICLE_RADIUS * 2)
+        ax.set_xlim(xmin, xmax)
+        ax.set_ylim(ymin, ymax)
+        ax.set_title(name)
+        ax.set_aspect(aspect=1)
+        ax.set_xlabel("X")
+        ax.set_ylabel("Y")
 
-    # Circles per simulation
-    circles = [
-        Circle((0, 0), PARTICLE_RADIUS, fc='blue', alpha=0.6)
-        for _ in range(num_particles)
-    ]
-    for c in circles:
-        ax.add_patch(c)
+        plots.append((name, sim_data, ax))
 
-    plots.append((sim_data, circles, ax))
+    if RAW_EXPORT:
+        print("Saving as mp4...")
+        export_comparison(
+            fig, plots, "particles.mp4", PARTICLE_RADIUS, rgb('blue', alpha=0.6), frame_times,
+            fps=30, workers=EXPORT_WORKERS,
+        )
+    else:
+        # All the particles of each simulation in a single artist
+        renderers = [ParticleRenderer(ax, PARTICLE_RADIUS, colors='blue', alpha=0.6) for _, _, ax in plots]
+        steps = [nearest_steps(sim_data.times, frame_times) for _, sim_data, _ in plots]
 
-# === Update function ===
-def update(frame):
-    artists = []
-    for sim_data, circles, ax in plots:
-        step = sim_data.steps[frame]
-        for i, particle in enumerate(step.particles):
-            x, y = particle.position
-            circles[i].center = (x, y)
-        ax.set_title(f"{ax.get_title().split()[0]} – Time: {step.time:.3f}s")
-        artists.extend(circles)
-    return artists
+        # === Update function ===
+        def update(frame):
+            artists = []
+            for (name, sim_data, ax), particles, sim_steps in zip(plots, renderers, steps):
+                step = sim_steps[frame]
+                artists.extend(particles.update(sim_data.state[step]))
+                ax.set_title(f"{name} – Time: {sim_data.times[step]:.3f}s")
+            return artists
 
-# === Animate ===
-ani = animation.FuncAnimation(
-    fig, update, frames=num_frames, interval=30, blit=True
-)
+        # === Animate ===
+        ani = animation.FuncAnimation(
+            fig, update, frames=num_frames, interval=30, blit=True
+        )
 
-# Save as MP4
-print("Saving as mp4...")
-from matplotlib.animation import FFMpegWriter
-ani.save("particles.mp4", writer=FFMpegWriter(fps=30, metadata=dict(artist='el tuki'), bitrate=1800))
+        # Save as MP4
+        print("Saving as mp4...")
+        from matplotlib.animation import FFMpegWriter
+        ani.save("particles.mp4", writer=FFMpegWriter(fps=30, metadata=dict(artist='el tuki'), bitrate=1800))
 
-# Show or save
-print("Plotting...")
-plt.tight_layout()
-plt.show()
+        # Show or save
+        print("Plotting...")
+        plt.tight_layout()
+        plt.show()
@@ -0,0 +1,112 @@
+# comparison.py
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+
+import numpy as np
+
+from file_loader import SimulationData
+from video import PackedFrames, Scene, TextSpec, ffmpeg_pipe
+
+def position_bounds(data: SimulationData, padding: float = 0.0) -> tuple[float, float, float, float]:
+    """(xmin, xmax, ymin, ymax) over every particle and step, with array reductions that also stream a mapped state."""
+    xs, ys = data.state[..., 0], data.state[..., 1]
+    return float(xs.min()) - padding, float(xs.max()) + padding, float(ys.min()) - padding, float(ys.max()) + padding
+
+def common_frame_times(simulations: list[SimulationData], frame_time: float | None = None) -> np.ndarray:
+    """
+    Frame times every frame_time over the span all the simulations cover. By default frame_time is the coarsest
+    saved interval among them, so no simulation has to repeat steps when they are saved equally often.
+    """
+    start = max(float(data.times[0]) for data in simulations)
+    end = min(float(data.times[-1]) for data in simulations)
+    if frame_time is None:
+        frame_time = max(float(np.median(np.diff(data.times))) if len(data.times) > 1 else 0.0 for data in simulations)
+    if frame_time <= 0 or end <= start:
+        return np.array([start])
+    return start + frame_time * np.arange(int(np.floor((end - start) / frame_time + 1e-9)) + 1)
+
+def nearest_steps(times: np.ndarray, frame_times: np.ndarray) -> np.ndarray:
+    """For each of the sorted frame_times, the index of the saved step of times nearest to it."""
+    following = np.clip(np.searchsorted(times, frame_times), 0, len(times) - 1)
+    previous = np.maximum(following - 1, 0)
+    return np.where(np.abs(times[following] - frame_times) <= np.abs(times[previous] - frame_times), following, previous)
+
+def _render_frames(scene: Scene) -> np.ndarray:
+    frames = np.empty((len(scene),) + scene.background.shape, dtype=np.uint8)
+    for index in range(len(scene)):
+        scene.render(index, frames[index])
+    return frames
+
+def export_comparison(fig, panels: list[tuple[str, SimulationData, object]], output_path: str, radius: float,
+                      color: np.ndarray, frame_times: np.ndarray, fps: float = 30, workers: int | None = None,
+                      chunk_size: int = 64, ffmpeg: str = 'ffmpeg') -> None:
+    """
+    Writes a video comparing several simulations side by side. panels holds (name, simulation, axes) with the axes
+    already laid out in fig; each one shows its simulation's step nearest to every frame time and the title
+    "{name} – Time: {t}s" with that step's time.
+
+    The figure is rendered once as the background. Then, for each chunk of chunk_size frames, every panel's region
+    is rasterized in a separate worker process, reading only the chunk's steps from its (possibly mapped) state, and
+    the main process pastes the regions into the frame and streams it to ffmpeg. A few chunks are kept in flight, so
+    memory stays bounded by the chunk size.
+
+    Scripts that call this must do so under if __name__ == "__main__", since the worker processes import them.
+    """
+    indices = [nearest_steps(np.asarray(data.times), frame_times) for _, data, _ in panels]
+    empty = PackedFrames.from_state(np.zeros((0, 0, 2)), color)
+    scene = Scene.from_figure(
+        fig,
+        panels=[(ax, radius, empty) for _, _, ax in panels],
+        texts=[
+            TextSpec(ax.title, f"{name} – Time: ", "s", "{:.3f}", np.asarray(data.times)[steps])
+            for (name, data, ax), steps in zip(panels, indices)
+        ],
+    )
+    height, width, _ = scene.background.shape
+
+    # Each panel's scene only covers its axes and title, so workers rasterize and send back just that region
+    regions = []
+    panel_scenes = []
+    for k in range(len(panels)):
+        (clip_row0, clip_row1, clip_col0, clip_col1), text = scene.panels[k].clip, scene.texts[k]
+        text_row0, text_row1, text_col0, text_col1 = text.region
+        region = (
+            max(min(clip_row0, text_row0), 0), min(max(clip_row1, text_row1), height),
+            max(min(clip_col0, text_col0), 0), min(max(clip_col1, text_col1), width),
+        )
+        regions.append(region)
+        panel_scenes.append(Scene(scene.background, [scene.panels[k]], [empty], [text]).crop(region))
+
+    def chunk_jobs(executor, start, stop):
+        jobs = []
+        for (_, data, _), steps, panel_scene in zip(panels, indices, panel_scenes):
+            frames = PackedFrames.from_state(data.state[steps[start:stop]], color)
+            jobs.append(executor.submit(
+                _render_frames,
+                replace(panel_scene, frames=[frames], texts=[panel_scene.texts[0].subset(start, stop)]),
+            ))
+        return jobs
+
+    buffer = np.empty_like(scene.background)
+    # The pool is closed before ffmpeg's stdin: forked workers inherit the pipe, and ffmpeg only ends once all close it
+    with ffmpeg_pipe(output_path, width, height, fps, ffmpeg) as stdin, ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = deque()
+
+        def write_oldest():
+            start, stop, jobs = in_flight.popleft()
+            rendered = [job.result() for job in jobs]
+            for i in range(stop - start):
+                np.copyto(buffer, scene.background)
+                for (row0, row1, col0, col1), frames in zip(regions, rendered):
+                    buffer[row0:row1, col0:col1] = frames[i]
+                stdin.write(buffer.data)
+
+        for start in range(0, len(frame_times), chunk_size):
+            stop = min(start + chunk_size, len(frame_times))
+            in_flight.append((start, stop, chunk_jobs(executor, start, stop)))
+            if len(in_flight) > 2:
+                write_oldest()
+        while in_flight:
+            write_oldest()
@@ -2,7 +2,6 @@ import matplotlib.pyplot as plt
 import numpy as np
 import os
 from file_loader import parse_simulation_file
-from math import exp, sqrt
 
 # Ruta donde están tus archivos .txt
 base_path = "../bin/Debug/net8.0"
@@ -15,8 +14,8 @@ A = 1.0
 
 # Solución analítica del oscilador amortiguado
 def analytical_position(t):
-    omega0 = sqrt(k / m - (gamma / (2 * m))**2)
-    return A * exp(-gamma * t / (2 * m)) * np.cos(omega0 * t)
+    omega0 = np.sqrt(k / m - (gamma / (2 * m))**2)
+    return A * np.exp(-gamma * t / (2 * m)) * np.cos(omega0 * t)
 
 # Archivos por método
 methods_files = {
@@ -54,10 +53,9 @@ for method, files in methods_files.items():
             print(f"Archivo no encontrado: {full_path}")
             continue
         sim = parse_simulation_file(full_path)
-        positions = [step.particles[0].position[0] for step in sim.steps]
-        times = [step.time for step in sim.steps]
-        analytic = [analytical_position(t) for t in times]
-        mse = np.mean([(x - y) ** 2 for x, y in zip(positions, analytic)])
+        positions = sim.state[:, 0, 0]
+        analytic = analytical_position(sim.times)
+        mse = np.mean((positions - analytic) ** 2)
         errors.append((dt, mse))
     method_errors[method] = sorted(errors)
 
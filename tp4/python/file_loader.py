@@ -1,60 +1,218 @@
 # file_loader.py
 
-import re
+import os
+from collections.abc import Sequence
 from dataclasses import dataclass
-from typing import List
 
-@dataclass
+import numpy as np
+
 class ParticleState:
-    position: tuple[float, float]
-    velocity: tuple[float, float]
+    """Lightweight view over one particle of one saved step of a SimulationData."""
+    __slots__ = ('_row',)
+
+    def __init__(self, row: np.ndarray):
+        self._row = row
+
+    @property
+    def position(self) -> tuple[float, float]:
+        return float(self._row[0]), float(self._row[1])
+
+    @property
+    def velocity(self) -> tuple[float, float]:
+        return float(self._row[2]), float(self._row[3])
+
+    def __repr__(self) -> str:
+        return f"ParticleState(position={self.position}, velocity={self.velocity})"
+
+class _ParticleStates(Sequence):
+    __slots__ = ('_rows',)
+
+    def __init__(self, rows: np.ndarray):
+        self._rows = rows
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [ParticleState(row) for row in self._rows[index]]
+        return ParticleState(self._rows[index])
 
-@dataclass
 class SimulationStep:
-    step: int
-    time: float
-    particles: List[ParticleState]
+    """Lightweight view over one saved step of a SimulationData."""
+    __slots__ = ('_data', '_index')
+
+    def __init__(self, data: 'SimulationData', index: int):
+        self._data = data
+        self._index = index
+
+    @property
+    def step(self) -> int:
+        return int(self._data.step_numbers[self._index])
+
+    @property
+    def time(self) -> float:
+        return float(self._data.times[self._index])
+
+    @property
+    def particles(self) -> Sequence[ParticleState]:
+        return _ParticleStates(self._data.state[self._index])
+
+    def __repr__(self) -> str:
+        return f"SimulationStep(step={self.step}, time={self.time}, particles=<{len(self.particles)} particles>)"
+
+class _SimulationSteps(Sequence):
+    __slots__ = ('_data',)
+
+    def __init__(self, data: 'SimulationData'):
+        self._data = data
+
+    def __len__(self) -> int:
+        return len(self._data.times)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [SimulationStep(self._data, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("step index out of range")
+        return SimulationStep(self._data, index)
 
 @dataclass
 class SimulationData:
+    """
+    A simulation held as arrays: state[t, i] holds (x, y, vx, vy) of particle i at saved step t. The steps property
+    gives SimulationStep/ParticleState views over these arrays, so sim.steps[t].particles[i].position keeps working.
+    """
     integration_type: str
     delta_time: float
-    masses: List[float]
-    steps: List[SimulationStep]
+    masses: np.ndarray
+    step_numbers: np.ndarray
+    times: np.ndarray
+    state: np.ndarray
+
+    @property
+    def steps(self) -> Sequence[SimulationStep]:
+        return _SimulationSteps(self)
 
-def parse_simulation_file(file_path: str) -> SimulationData:
+@dataclass
+class SimulationHeader:
+    """The constants written at the start of a simulation file, before the first step."""
+    integration_type: str
+    delta_time: float
+    masses: np.ndarray
+
+    @property
+    def particle_count(self) -> int:
+        return len(self.masses)
+
+def _header_value(line: str, key: str) -> str:
+    name, separator, value = line.partition(':')
+    if not separator or name.strip() != key:
+        raise ValueError(f"Expected a '{key}:' header line, got {line.strip()!r}")
+    return value.strip()
+
+def _read_header(file) -> SimulationHeader:
+    integration_type = _header_value(file.readline(), 'IntegrationType')
+    delta_time = float(_header_value(file.readline(), 'DeltaTime'))
+
+    masses_text = _header_value(file.readline(), 'Masses')
+    if not masses_text.startswith('[') or not masses_text.endswith(']'):
+        raise ValueError(f"Expected a bracketed list of masses, got {masses_text!r}")
+    masses_text = masses_text[1:-1].replace(',', ' ')
+    masses = np.fromstring(masses_text, dtype=np.float64, sep=' ') if masses_text.strip() else np.zeros(0)
+
+    return SimulationHeader(integration_type=integration_type, delta_time=delta_time, masses=masses)
+
+def read_header(file_path: str) -> SimulationHeader:
+    """Reads only the header of a simulation file (integration type, delta time and masses), without the steps."""
+    with open(file_path, 'r') as file:
+        return _read_header(file)
+
+_BODY_SEPARATORS = str.maketrans('[];', '   ')
+
+def _parse_file(file_path: str) -> SimulationData:
     with open(file_path, 'r') as file:
-        lines = [line.strip() for line in file if line.strip()]
-
-    integration_type = lines[0].split(':', 1)[1].strip()
-    delta_time = float(lines[1].split(':', 1)[1].strip())
-    masses = eval(lines[2].split(':', 1)[1].strip())
-
-    step_lines = lines[3:]
-    steps = []
-
-    for line in step_lines:
-        match = re.match(r'\[(\d+)\s+([\d.]+)\]\s+(.*)', line)
-        if not match:
-            continue
-        step_number = int(match.group(1))
-        time = float(match.group(2))
-        particle_data = match.group(3).split(';')
-
-        particles = []
-        for pdata in particle_data:
-            values = list(map(float, pdata.strip().split()))
-            if len(values) != 4:
-                continue
-            pos = (values[0], values[1])
-            vel = (values[2], values[3])
-            particles.append(ParticleState(position=pos, velocity=vel))
-
-        steps.append(SimulationStep(step=step_number, time=time, particles=particles))
+        header = _read_header(file)
+        body = file.read()
+
+    # Each line is "[step time] x y vx vy ; x y vx vy ; ...", so once the brackets and semicolons are gone the whole
+    # body is a flat list of numbers that numpy can parse in one go. A last line without a newline is kept only if it
+    # has a whole record; otherwise it was cut short by an interrupted run and is dropped.
+    row_length = 2 + 4 * header.particle_count
+    complete_end = body.rfind('\n') + 1
+    tail = body[complete_end:].translate(_BODY_SEPARATORS)
+    body = body[:complete_end].translate(_BODY_SEPARATORS)
+    if len(tail.split()) == row_length:
+        body += tail
+    values = np.fromstring(body, dtype=np.float64, sep=' ')
+    rows = values[:len(values) - len(values) % row_length].reshape(-1, row_length)
 
     return SimulationData(
-        integration_type=integration_type,
-        delta_time=delta_time,
-        masses=masses,
-        steps=steps
+        integration_type=header.integration_type,
+        delta_time=header.delta_time,
+        masses=header.masses,
+        step_numbers=rows[:, 0].astype(np.int64),
+        times=rows[:, 1].copy(),
+        state=rows[:, 2:].reshape(-1, header.particle_count, 4).copy(),
     )
+
+def _cache_paths(file_path: str) -> tuple[str, str]:
+    return file_path + '.cache.npz', file_path + '.state.npy'
+
+def _source_key(file_path: str) -> np.ndarray:
+    stat = os.stat(file_path)
+    return np.array([stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+
+def _read_cache(file_path: str, mmap: bool = False) -> SimulationData | None:
+    meta_path, state_path = _cache_paths(file_path)
+    if not os.path.exists(meta_path) or not os.path.exists(state_path):
+        return None
+
+    with np.load(meta_path) as meta:
+        if not np.array_equal(meta['source_key'], _source_key(file_path)):
+            return None
+        return SimulationData(
+            integration_type=str(meta['integration_type']),
+            delta_time=float(meta['delta_time']),
+            masses=meta['masses'],
+            step_numbers=meta['step_numbers'],
+            times=meta['times'],
+            state=np.load(state_path, mmap_mode='r' if mmap else None),
+        )
+
+def _write_cache(file_path: str, data: SimulationData, source_key: np.ndarray) -> None:
+    meta_path, state_path = _cache_paths(file_path)
+    try:
+        np.save(state_path, data.state)
+        np.savez(
+            meta_path,
+            source_key=source_key,
+            integration_type=data.integration_type,
+            delta_time=data.delta_time,
+            masses=data.masses,
+            step_numbers=data.step_numbers,
+            times=data.times,
+        )
+    except OSError as e:
+        print(f"Could not write cache for {file_path}: {e}")
+
+def parse_simulation_file(file_path: str, use_cache: bool = True, mmap: bool = False) -> SimulationData:
+    """
+    Loads a simulation file. The parsed arrays are cached next to the source file (.cache.npz and .state.npy)
+    and reused while the source's size and modification time don't change. With mmap=True the state is
+    memory-mapped from the .state.npy cache instead of read, writing the cache first if needed.
+    """
+    if use_cache:
+        cached = _read_cache(file_path, mmap)
+        if cached is not None:
+            return cached
+
+    source_key = _source_key(file_path)
+    data = _parse_file(file_path)
+    if use_cache:
+        _write_cache(file_path, data, source_key)
+        if mmap:
+            return _read_cache(file_path, mmap) or data
+    return data
@@ -23,10 +23,10 @@ plt.figure(figsize=(10, 6))
 # Plot simulation data
 for method, file_path in output_files.items():
     sim_data = parse_simulation_file(file_path)
-    times = [step.time for step in sim_data.steps]
-    x_positions = [step.particles[0].position[0] for step in sim_data.steps]
+    times = sim_data.times
+    x_positions = sim_data.state[:, 0, 0]
     plt.plot(times, x_positions, linestyle='--', linewidth=2, label=method)
-    if not time_range:
+    if len(time_range) == 0:
         time_range = times
 
 # Plot analytical solution
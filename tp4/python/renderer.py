@@ -0,0 +1,36 @@
+# renderer.py
+# tp5/python/renderer.py is a copy of this module with its comments in Spanish, and tp3-gpu/python/renderer.py the
+# same class with Spanish names; change all of them together.
+
+import numpy as np
+from matplotlib.collections import EllipseCollection
+
+class ParticleRenderer:
+    """
+    Draws every particle with a single EllipseCollection instead of one Circle patch per particle. Radii are in data
+    units, and each frame only moves the offsets with set_offsets, so blitting redraws one artist. A linewidth
+    above 0 adds an outline of that width (in points) in each particle's color, like a Circle with color= has.
+    """
+    def __init__(self, ax, radii, colors='blue', alpha: float = 1.0, linewidth: float = 0, zorder: int = 2):
+        radii = np.atleast_1d(np.asarray(radii, dtype=float))
+        self.collection = EllipseCollection(
+            widths=2 * radii, heights=2 * radii, angles=0, units='xy',
+            offsets=np.zeros((len(radii), 2)), offset_transform=ax.transData,
+            facecolors=colors, edgecolors='face' if linewidth > 0 else 'none', linewidths=linewidth, alpha=alpha, zorder=zorder,
+        )
+        ax.add_collection(self.collection)
+
+    def update(self, positions: np.ndarray, colors=None, radii=None) -> list:
+        """
+        Moves the particles to positions, an (N, 2) array (extra columns are ignored). N may change between frames,
+        in which case colors and radii must be given per particle unless they are all the same. Returns the artists
+        to blit.
+        """
+        self.collection.set_offsets(np.asarray(positions)[:, 0:2])
+        if colors is not None:
+            self.collection.set_facecolor(colors)
+        if radii is not None:
+            radii = np.atleast_1d(np.asarray(radii, dtype=float))
+            self.collection.set_widths(2 * radii)
+            self.collection.set_heights(2 * radii)
+        return [self.collection]
@@ -0,0 +1,351 @@
+# video.py
+# tp5/python/video.py is a copy of this module with its comments in Spanish; change both together.
+
+import os
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from typing import Callable
+
+import numpy as np
+from matplotlib.colors import to_rgb
+
+def rgb(color, alpha: float = 1.0, background='white') -> np.ndarray:
+    """A matplotlib color as uint8 RGB, blended over background when alpha is below 1."""
+    blended = alpha * np.array(to_rgb(color)) + (1 - alpha) * np.array(to_rgb(background))
+    return np.round(255 * blended).astype(np.uint8)
+
+def _render(fig) -> np.ndarray:
+    fig.canvas.draw()
+    return np.asarray(fig.canvas.buffer_rgba())[..., :3].copy()
+
+@dataclass
+class Panel:
+    """
+    Where the particles of one axes go in the frame: pixel (col, row) = position * scale + offset, clipped to the axes
+    box (row0, row1, col0, col1), with each particle drawn as the pixels of stencil, (row, col) offsets of a disc.
+    """
+    scale: np.ndarray
+    offset: np.ndarray
+    clip: tuple[int, int, int, int]
+    stencil: np.ndarray
+
+    @classmethod
+    def from_axes(cls, ax, radius: float, height: int) -> 'Panel':
+        """Takes the mapping from the axes' current limits; only linear axes are supported."""
+        origin, unit = ax.transData.transform([[0.0, 0.0], [1.0, 1.0]])
+        scale = np.array([unit[0] - origin[0], origin[1] - unit[1]])
+        offset = np.array([origin[0], height - origin[1]])
+
+        x0, y0, x1, y1 = ax.bbox.extents
+        clip = (max(int(np.floor(height - y1)), 0), int(np.ceil(height - y0)), max(int(np.floor(x0)), 0), int(np.ceil(x1)))
+
+        radius_cols = max(abs(radius * scale[0]), 0.5)
+        radius_rows = max(abs(radius * scale[1]), 0.5)
+        rows, cols = np.meshgrid(
+            np.arange(-np.ceil(radius_rows), np.ceil(radius_rows) + 1),
+            np.arange(-np.ceil(radius_cols), np.ceil(radius_cols) + 1),
+            indexing='ij',
+        )
+        inside = (cols / radius_cols) ** 2 + (rows / radius_rows) ** 2 <= 1
+        stencil = np.column_stack([rows[inside], cols[inside]]).astype(np.int64)
+        return cls(scale=scale, offset=offset, clip=clip, stencil=stencil)
+
+    def splat(self, buffer: np.ndarray, positions: np.ndarray, colors: np.ndarray) -> None:
+        """Draws a disc of the matching color (an (N, 3) uint8 array) at each of the (N, 2) positions."""
+        centers = np.floor(positions[:, 0:2] * self.scale + self.offset).astype(np.int64)
+        rows = centers[:, 1, None] + self.stencil[None, :, 0]
+        cols = centers[:, 0, None] + self.stencil[None, :, 1]
+        row0, row1, col0, col1 = self.clip
+        row1, col1 = min(row1, buffer.shape[0]), min(col1, buffer.shape[1])
+        inside = (rows >= row0) & (rows < row1) & (cols >= col0) & (cols < col1)
+        particle = np.broadcast_to(np.arange(len(centers))[:, None], rows.shape)
+        buffer[rows[inside], cols[inside]] = colors[particle[inside]]
+
+    def shifted(self, row0: int, col0: int) -> 'Panel':
+        """The same panel in a frame cropped to start at (row0, col0)."""
+        row_start, row_stop, col_start, col_stop = self.clip
+        clip = (max(row_start - row0, 0), row_stop - row0, max(col_start - col0, 0), col_stop - col0)
+        return replace(self, offset=self.offset - [col0, row0], clip=clip)
+
+@dataclass
+class PackedFrames:
+    """The particles of one panel over all the frames, packed: frame i is positions/colors[offsets[i]:offsets[i + 1]]."""
+    offsets: np.ndarray
+    positions: np.ndarray
+    colors: np.ndarray
+
+    @classmethod
+    def from_state(cls, state: np.ndarray, color: np.ndarray) -> 'PackedFrames':
+        """From a (T, N, >=2) state array where every particle has the same color."""
+        frames, particles = state.shape[0], state.shape[1]
+        positions = np.ascontiguousarray(state[:, :, 0:2], dtype=np.float32).reshape(-1, 2)
+        return cls(
+            offsets=np.arange(frames + 1) * particles,
+            positions=positions,
+            colors=np.broadcast_to(np.asarray(color, dtype=np.uint8), (len(positions), 3)).copy(),
+        )
+
+    @classmethod
+    def from_frames(cls, frames: list[tuple[np.ndarray, np.ndarray]]) -> 'PackedFrames':
+        """From a list of (positions (N, 2), colors (N, 3)) pairs, where N may change between frames."""
+        lengths = [len(positions) for positions, _ in frames]
+        return cls(
+            offsets=np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64),
+            positions=np.concatenate([positions for positions, _ in frames]).astype(np.float32).reshape(-1, 2),
+            colors=np.concatenate([colors for _, colors in frames]).astype(np.uint8).reshape(-1, 3),
+        )
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> tuple[np.ndarray, np.ndarray]:
+        start, stop = self.offsets[index], self.offsets[index + 1]
+        return self.positions[start:stop], self.colors[start:stop]
+
+    def subset(self, start: int, stop: int) -> 'PackedFrames':
+        first, last = self.offsets[start], self.offsets[stop]
+        return PackedFrames(
+            offsets=self.offsets[start:stop + 1] - first,
+            positions=self.positions[first:last],
+            colors=self.colors[first:last],
+        )
+
+    def packed(self) -> 'PackedFrames':
+        return self
+
+@dataclass
+class LazyFrames:
+    """
+    Frames [start, stop) of a source that are only loaded when rendered: load(start, stop) returns their
+    PackedFrames. load is sent to the worker processes, so it must be picklable (a module-level function or a
+    functools.partial of one), and each worker loads just the chunk it is encoding.
+    """
+    load: Callable[[int, int], PackedFrames]
+    start: int
+    stop: int
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def subset(self, start: int, stop: int) -> 'LazyFrames':
+        return replace(self, start=self.start + start, stop=self.start + stop)
+
+    def packed(self) -> PackedFrames:
+        return self.load(self.start, self.stop)
+
+@dataclass
+class TextSpec:
+    """
+    A text artist of the figure that shows prefix + a formatted value + suffix on each frame. values holds the value
+    of every frame, and width is the number of characters reserved for it.
+    """
+    artist: object
+    prefix: str
+    suffix: str
+    fmt: str
+    values: np.ndarray
+    width: int | None = None
+
+    def formatted(self, value) -> str:
+        return self.fmt.format(value)
+
+@dataclass
+class TextStrip:
+    """
+    A monospaced text whose changing characters are copied from pre-rendered strips instead of drawn. glyphs[c] is the
+    text's region rendered with every changing cell showing c, and cells[i] the columns of changing cell i.
+    """
+    fmt: str
+    width: int
+    region: tuple[int, int, int, int]
+    cells: np.ndarray
+    glyphs: dict[str, np.ndarray]
+    values: np.ndarray
+
+    def stamp(self, buffer: np.ndarray, value) -> None:
+        row0, row1, _, _ = self.region
+        text = self.fmt.format(value).rjust(self.width)[:self.width]
+        for (col0, col1), char in zip(self.cells, text):
+            glyph = self.glyphs.get(char)
+            if glyph is not None:
+                buffer[row0:row1, col0:col1] = glyph[:, col0 - self.region[2]:col1 - self.region[2]]
+
+    def subset(self, start: int, stop: int) -> 'TextStrip':
+        return replace(self, values=self.values[start:stop])
+
+    def shifted(self, row0: int, col0: int) -> 'TextStrip':
+        """The same text in a frame cropped to start at (row0, col0); the text must be inside the crop."""
+        row_start, row_stop, col_start, col_stop = self.region
+        return replace(self, region=(row_start - row0, row_stop - row0, col_start - col0, col_stop - col0), cells=self.cells - col0)
+
+def _text_strips(fig, texts: list[TextSpec], charset: str) -> tuple[np.ndarray, list[TextStrip]]:
+    widths = []
+    for spec in texts:
+        spec.artist.set_fontfamily('monospace')
+        widths.append(spec.width or max(len(spec.formatted(value)) for value in spec.values))
+
+    def show(char):
+        for spec, width in zip(texts, widths):
+            spec.artist.set_text(spec.prefix + char * width + spec.suffix)
+
+    # The background has blanks where the values go; then one render per character fills every blank with it
+    show(' ')
+    background = _render(fig)
+    height = background.shape[0]
+    renderer = fig.canvas.get_renderer()
+
+    layouts = []
+    for spec, width in zip(texts, widths):
+        x0, y0, x1, y1 = spec.artist.get_window_extent(renderer).extents
+        advance = (x1 - x0) / (len(spec.prefix) + width + len(spec.suffix))
+        starts = x0 + advance * (len(spec.prefix) + np.arange(width + 1))
+        bounds = np.clip(np.round(starts).astype(np.int64), 0, background.shape[1])
+        cells = np.column_stack([bounds[:-1], bounds[1:]])
+        region = (
+            max(int(np.floor(height - y1)), 0), min(int(np.ceil(height - y0)), height),
+            int(bounds[0]), int(bounds[-1]),
+        )
+        layouts.append((region, cells))
+
+    glyphs = [{} for _ in texts]
+    for char in charset:
+        show(char)
+        image = _render(fig)
+        for strip_glyphs, ((row0, row1, col0, col1), _) in zip(glyphs, layouts):
+            strip_glyphs[char] = image[row0:row1, col0:col1].copy()
+    show(' ')
+
+    strips = [
+        TextStrip(spec.fmt, width, region, cells, strip_glyphs, np.asarray(spec.values))
+        for spec, width, (region, cells), strip_glyphs in zip(texts, widths, layouts, glyphs)
+    ]
+    return background, strips
+
+@dataclass
+class Scene:
+    """
+    Everything needed to rasterize the frames of a video without matplotlib: a pre-rendered background, the panels
+    where particles are splatted, their positions per frame (packed, or loaded on demand), and the texts that change
+    per frame. It only holds arrays and picklable loaders, so it can be sent to worker processes.
+    """
+    background: np.ndarray
+    panels: list[Panel]
+    frames: list[PackedFrames | LazyFrames]
+    texts: list[TextStrip]
+
+    @classmethod
+    def from_figure(cls, fig, panels: list[tuple[object, float, PackedFrames | LazyFrames]],
+                    texts: list[TextSpec] = (), charset: str = '0123456789.-') -> 'Scene':
+        """
+        Renders fig once as the background, so it must already have its axes, limits and static artists but no
+        particles. panels holds (axes, particle radius, frames) and texts the artists that show a value per frame;
+        they are switched to a monospace font.
+        """
+        background, strips = _text_strips(fig, list(texts), charset)
+        # Even dimensions, as yuv420p needs
+        background = background[:background.shape[0] // 2 * 2, :background.shape[1] // 2 * 2]
+        height = background.shape[0]
+        return cls(
+            background=np.ascontiguousarray(background),
+            panels=[Panel.from_axes(ax, radius, height) for ax, radius, _ in panels],
+            frames=[frames for _, _, frames in panels],
+            texts=strips,
+        )
+
+    def __len__(self) -> int:
+        return len(self.frames[0]) if self.frames else len(self.texts[0].values)
+
+    def render(self, index: int, buffer: np.ndarray) -> None:
+        """Draws frame index into buffer; the scene's frames must be packed."""
+        np.copyto(buffer, self.background)
+        for panel, frames in zip(self.panels, self.frames):
+            panel.splat(buffer, *frames[index])
+        for text in self.texts:
+            text.stamp(buffer, text.values[index])
+
+    def subset(self, start: int, stop: int) -> 'Scene':
+        return replace(
+            self,
+            frames=[frames.subset(start, stop) for frames in self.frames],
+            texts=[text.subset(start, stop) for text in self.texts],
+        )
+
+    def packed(self) -> 'Scene':
+        """The scene with every panel's frames loaded, ready to render."""
+        return replace(self, frames=[frames.packed() for frames in self.frames])
+
+    def crop(self, region: tuple[int, int, int, int]) -> 'Scene':
+        """The scene restricted to the pixels in region (row0, row1, col0, col1), which must contain its texts."""
+        row0, row1, col0, col1 = region
+        return replace(
+            self,
+            background=np.ascontiguousarray(self.background[row0:row1, col0:col1]),
+            panels=[panel.shifted(row0, col0) for panel in self.panels],
+            texts=[text.shifted(row0, col0) for text in self.texts],
+        )
+
+@contextmanager
+def ffmpeg_pipe(output_path: str, width: int, height: int, fps: float, ffmpeg: str = 'ffmpeg'):
+    """Starts ffmpeg encoding raw rgb24 frames of width x height from its stdin, which is what this yields."""
+    command = [
+        ffmpeg, '-y', '-loglevel', 'error',
+        '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-s', f'{width}x{height}', '-r', str(fps), '-i', '-',
+        '-c:v', 'libx264', '-pix_fmt', 'yuv420p', output_path,
+    ]
+    with subprocess.Popen(command, stdin=subprocess.PIPE) as process:
+        yield process.stdin
+        process.stdin.close()
+    if process.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed with exit code {process.returncode} while writing {output_path}")
+
+def _encode(scene: Scene, output_path: str, fps: float, ffmpeg: str, chunk_size: int) -> str:
+    height, width, _ = scene.background.shape
+    buffer = np.empty_like(scene.background)
+    with ffmpeg_pipe(output_path, width, height, fps, ffmpeg) as stdin:
+        for start in range(0, len(scene), chunk_size):
+            chunk = scene.subset(start, min(start + chunk_size, len(scene))).packed()
+            for index in range(len(chunk)):
+                chunk.render(index, buffer)
+                stdin.write(buffer.data)
+    return output_path
+
+def export_video(scene: Scene, output_path: str, fps: float = 30, workers: int = 1, ffmpeg: str = 'ffmpeg',
+                 chunk_size: int = 256) -> None:
+    """
+    Writes the scene's frames to output_path, piping raw RGB frames rendered into one reused buffer to ffmpeg's stdin.
+    With workers > 1 the frames are split into that many contiguous ranges, each encoded to its own segment by a
+    worker process, and the segments are joined with ffmpeg's concat demuxer without re-encoding.
+
+    Frames are loaded chunk_size at a time, so with LazyFrames the memory used doesn't grow with the video's length.
+
+    Scripts that use workers must call this under if __name__ == "__main__", since the worker processes import them.
+    """
+    workers = max(1, min(workers, len(scene)))
+    if workers == 1:
+        _encode(scene, output_path, fps, ffmpeg, chunk_size)
+        return
+
+    bounds = np.linspace(0, len(scene), workers + 1).astype(np.int64)
+    extension = os.path.splitext(output_path)[1] or '.mp4'
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(output_path))) as directory:
+        segments = [os.path.join(directory, f'segment-{k}{extension}') for k in range(workers)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(
+                _encode,
+                [scene.subset(start, stop) for start, stop in zip(bounds[:-1], bounds[1:])],
+                segments,
+                [fps] * workers,
+                [ffmpeg] * workers,
+                [chunk_size] * workers,
+            ))
+
+        list_path = os.path.join(directory, 'segments.txt')
+        with open(list_path, 'w') as file:
+            file.writelines(f"file '{segment}'\n" for segment in segments)
+        subprocess.run(
+            [ffmpeg, '-y', '-loglevel', 'error', '-f', 'concat', '-safe', '0', '-i', list_path, '-c', 'copy', output_path],
+            check=True,
+        )
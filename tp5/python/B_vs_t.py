@@ -1,7 +1,7 @@
 import os
-import json
 import numpy as np
 import matplotlib.pyplot as plt
+from file_loader import read_final_time
 
 # Parámetros
 B_values = [0.02, 0.04, 0.06, 0.08, 0.10]
@@ -28,17 +28,7 @@ for B_val in B_values:
             print(f"Archivo no encontrado: {file_path}")
             continue
 
-        last_time = None
-
-        with open(file_path, 'r') as f:
-            for line in f:
-                if "step" not in line:
-                    continue
-                try:
-                    time_info = json.loads(line.strip().split(" ; ")[0])
-                    last_time = time_info["time"]
-                except (json.JSONDecodeError, IndexError, KeyError):
-                    continue
+        last_time = read_final_time(file_path)
 
         if last_time is not None:
             tf_values.append(last_time)
@@ -1,7 +1,7 @@
 import os
-import json
 import numpy as np
 import matplotlib.pyplot as plt
+from file_loader import read_final_time
 
 # Parámetros
 q_values = [2, 4, 6, 8]
@@ -31,16 +31,7 @@ for Q in q_values:
             continue
 
         # Leer tiempo final de ese archivo
-        last_time = None
-        with open(file_path_clean, 'r') as f:
-            for line in f:
-                if "step" not in line:
-                    continue
-                try:
-                    time_info = json.loads(line.strip().split(" ; ")[0])
-                    last_time = time_info["time"]
-                except (json.JSONDecodeError, IndexError, KeyError):
-                    continue
+        last_time = read_final_time(file_path_clean)
 
         if last_time is not None:
             tf_values.append(last_time)
@@ -1,88 +1,84 @@
+import os
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 import matplotlib.animation as animation
-import json
-import re
+import numpy as np
+from functools import partial
+from file_loader import index_frames, read_frames_at
+from renderer import ParticleRenderer
+from video import LazyFrames, PackedFrames, Scene, TextSpec, export_video, rgb
 
 # Dimensiones del pasillo según tu config
 HALLWAY_LENGTH = 16
 HALLWAY_WIDTH = 3.6
+PARTICLE_RADIUS = 0.25
 
 # Colores para cada dirección
 COLOR_LEFT = "#228be6"  # azul
 COLOR_RIGHT = "#fa5252"  # rojo
 
-def parse_output(filename):
-    frames = []
-    times = []
-    with open(filename, "r") as f:
-        for line in f:
-            # Solo líneas con partículas (las que tienen ';')
-            if ";" in line:
-                state = []
-                # Ejemplo de línea:
-                # {"step": 101, "time": 0.101} ; {"id": 1, ...} ; {"id": 2, ...}
-                step_data, *particle_data = line.strip().split(" ; ")
-                
-                # Extraer información del tiempo
-                step_info = json.loads(step_data.strip())
-                times.append(step_info.get("time", 0))
-                
-                # Cada partícula es un JSON
-                for pdata in particle_data:
-                    pdata = pdata.strip()
-                    if pdata.endswith(","):
-                        pdata = pdata[:-1]
-                    p = json.loads(pdata)
-                    state.append(p)
-                frames.append(state)
-    return frames, times
-
-frames, times = parse_output("../bin/Debug/net8.0/animations/output-simple-Q8-beeman-run-blocked.txt")
-
-fig, ax = plt.subplots(figsize=(12, 4))
-ax.set_xlim(0, HALLWAY_LENGTH)
-ax.set_ylim(-0.5, HALLWAY_WIDTH + 1)  # Más espacio para el texto
-ax.set_aspect('equal')
-
-# Dibuja las paredes del pasillo
-ax.add_patch(patches.Rectangle((0, 0), HALLWAY_LENGTH, HALLWAY_WIDTH, fill=False, linewidth=2))
-
-# Prepara los objetos para las partículas (círculos)
-max_particles = max(len(f) for f in frames)
-circles = []
-for _ in range(max_particles):
-    circ = plt.Circle((0, 0), 0.25, color='gray', alpha=1)
-    circles.append(circ)
-    ax.add_patch(circ)
-
-# Agregar texto para mostrar el tiempo en la esquina superior izquierda
-time_text = ax.text(0.2, HALLWAY_WIDTH + 0.5, '', fontsize=16, ha='left', weight='bold', 
-                   bbox=dict(boxstyle="round,pad=0.3", facecolor="white", alpha=0.8))
-
-def update(frame_idx):
-    frame = frames[frame_idx]
-    current_time = times[frame_idx]
-    
-    # Actualizar el texto del tiempo
-    time_text.set_text(f'Tiempo: {current_time:.3f} s')
-    
-    # Oculta todos
-    for c in circles:
-        c.set_visible(False)
-    for i, p in enumerate(frame):
-        circles[i].center = (p['x'], p['y'])
-        # El color según el nombre
-        if "Left" in p['name']:
-            circles[i].set_color(COLOR_LEFT)
-        else:
-            circles[i].set_color(COLOR_RIGHT)
-        circles[i].set_visible(True)
-    return circles + [time_text]
-
-ani = animation.FuncAnimation(fig, update, frames=len(frames), interval=8, blit=True)
-
-# Guardar como MP4 acelerado 5x (interval reducido de 40 a 8)
-ani.save('Q8-blocked.mp4', writer='ffmpeg', fps=30, dpi=100)
-
-print("Animación guardada")
+# Exportar rasterizando las partículas con numpy y pasando los fotogramas a ffmpeg, en lugar de redibujar la figura
+# con matplotlib en cada fotograma. EXPORT_WORKERS procesos renderizan partes del video en paralelo.
+RAW_EXPORT = True
+EXPORT_WORKERS = os.cpu_count() or 1
+
+INPUT_FILE = "../bin/Debug/net8.0/animations/output-simple-Q8-beeman-run-blocked.txt"
+
+def pack_frames(file_path, offsets, start, stop):
+    """Lee los frames [start, stop) de offsets y los empaqueta con el color según la dirección de cada partícula."""
+    left, right = rgb(COLOR_LEFT), rgb(COLOR_RIGHT)
+    return PackedFrames.from_frames([
+        (np.column_stack([f.x, f.y]), np.where(f.name_contains("Left")[:, None], left, right))
+        for f in read_frames_at(file_path, offsets[start:stop])
+    ])
+
+if __name__ == "__main__":
+    # Solo los frames con partículas. Se guarda dónde empieza cada uno y su tiempo, y las partículas se leen del
+    # archivo recién cuando se dibujan
+    offsets, times = index_frames(INPUT_FILE, with_particles=True)
+
+    fig, ax = plt.subplots(figsize=(12, 4))
+    ax.set_xlim(0, HALLWAY_LENGTH)
+    ax.set_ylim(-0.5, HALLWAY_WIDTH + 1)  # Más espacio para el texto
+    ax.set_aspect('equal')
+
+    # Dibuja las paredes del pasillo
+    ax.add_patch(patches.Rectangle((0, 0), HALLWAY_LENGTH, HALLWAY_WIDTH, fill=False, linewidth=2))
+
+    # Agregar texto para mostrar el tiempo en la esquina superior izquierda
+    time_text = ax.text(0.2, HALLWAY_WIDTH + 0.5, '', fontsize=16, ha='left', weight='bold',
+                       bbox=dict(boxstyle="round,pad=0.3", facecolor="white", alpha=0.8))
+
+    if RAW_EXPORT:
+        # El fondo (paredes y recuadro del tiempo) se dibuja una sola vez, y cada proceso lee y empaqueta de a un
+        # bloque los frames de su parte del video, así que la memoria no crece con el largo de la corrida
+        frames = LazyFrames(partial(pack_frames, INPUT_FILE, offsets), 0, len(offsets))
+        scene = Scene.from_figure(
+            fig,
+            panels=[(ax, PARTICLE_RADIUS, frames)],
+            texts=[TextSpec(time_text, 'Tiempo: ', ' s', '{:.3f}', times)],
+        )
+        export_video(scene, 'Q8-blocked.mp4', fps=30, workers=EXPORT_WORKERS)
+    else:
+        # Todas las partículas en un solo artista
+        particles = ParticleRenderer(ax, PARTICLE_RADIUS, colors='gray', linewidth=1)
+
+        def update(frame_idx):
+            # Cada frame se lee del archivo cuando se dibuja
+            frame = read_frames_at(INPUT_FILE, offsets[frame_idx:frame_idx + 1])[0]
+            current_time = times[frame_idx]
+
+            # Actualizar el texto del tiempo
+            time_text.set_text(f'Tiempo: {current_time:.3f} s')
+
+            # Solo se dibujan las partículas de este frame, con el color según el nombre
+            colors = np.where(frame.name_contains("Left"), COLOR_LEFT, COLOR_RIGHT)
+            artists = particles.update(np.column_stack([frame.x, frame.y]), colors=colors)
+            return artists + [time_text]
+
+        ani = animation.FuncAnimation(fig, update, frames=len(offsets), interval=8, blit=True)
+
+        # Guardar como MP4 acelerado 5x (interval reducido de 40 a 8)
+        ani.save('Q8-blocked.mp4', writer='ffmpeg', fps=30, dpi=100)
+
+    print("Animación guardada")
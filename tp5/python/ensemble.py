@@ -0,0 +1,77 @@
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+
+import pandas as pd
+
+from reducers import Blocked, FinalTime, MeanAbsVx, Reducer, reduce_run
+
+# output-simple-Q{Q}[-B{B}]-beeman-run-{run}[-b].txt, donde el sufijo -b marca una corrida guardada como bloqueada
+RUN_FILE_PATTERN = re.compile(
+    r'^output-simple-Q(?P<Q>\d+(?:\.\d+)?)(?:-B(?P<B>\d+(?:\.\d+)?))?-beeman-run-(?P<run>\d+)(?P<blocked>-b)?\.txt$'
+)
+
+@dataclass
+class RunFile:
+    path: str
+    Q: float
+    B: float | None
+    run: int
+    marked_blocked: bool
+
+def discover_runs(directory: str, merge_blocked: bool = False) -> list[RunFile]:
+    """
+    Busca las salidas de las corridas de un directorio por su nombre de archivo. Cada archivo es una corrida, así que
+    una corrida guardada normal y con -b aparece dos veces. Con merge_blocked=True de esas corridas solo queda el
+    archivo -b, como hace q_vs_t_90.py.
+    """
+    if not os.path.isdir(directory):
+        return []
+
+    runs = {}
+    for name in sorted(os.listdir(directory)):
+        match = RUN_FILE_PATTERN.match(name)
+        if match is None:
+            continue
+        run = RunFile(
+            path=os.path.join(directory, name),
+            Q=float(match['Q']),
+            B=float(match['B']) if match['B'] is not None else None,
+            run=int(match['run']),
+            marked_blocked=match['blocked'] is not None,
+        )
+        key = (run.Q, run.B, run.run) if merge_blocked else run.path
+        if key not in runs or run.marked_blocked:
+            runs[key] = run
+    return list(runs.values())
+
+def run_ensemble(directory: str, reducers: list[Reducer] | None = None, max_workers: int | None = None,
+                 merge_blocked: bool = False) -> pd.DataFrame:
+    """
+    Calcula los reducers (por defecto Blocked, FinalTime y MeanAbsVx) sobre cada corrida encontrada en directory, con
+    una pasada por archivo y los archivos repartidos en un pool de procesos. Devuelve una tabla con una fila por
+    archivo: Q, B, run, path y marked_blocked (guardada con el sufijo -b), seguidas de las columnas de los reducers.
+    Las corridas marcadas como bloqueadas siempre tienen blocked en True. merge_blocked se pasa a discover_runs.
+
+    Los scripts que lo llamen tienen que hacerlo bajo if __name__ == "__main__", porque los procesos los importan.
+    """
+    if reducers is None:
+        reducers = [Blocked(), FinalTime(), MeanAbsVx()]
+
+    runs = discover_runs(directory, merge_blocked)
+    reduce = partial(reduce_run, reducers=reducers)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        summaries = list(executor.map(reduce, [run.path for run in runs]))
+
+    rows = []
+    for run, summary in zip(runs, summaries):
+        row = {'Q': run.Q, 'B': run.B, 'run': run.run, 'path': run.path, 'marked_blocked': run.marked_blocked, **summary}
+        if run.marked_blocked and 'blocked' in row:
+            row['blocked'] = True
+        rows.append(row)
+
+    if not rows:
+        return pd.DataFrame(columns=['Q', 'B', 'run', 'path', 'marked_blocked'])
+    return pd.DataFrame(rows).sort_values(['Q', 'B', 'run', 'marked_blocked'], ignore_index=True)
@@ -0,0 +1,193 @@
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Iterator
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _loads(text: str):
+    # orjson es varias veces más rápido, pero rechaza los NaN/Infinity que escribe el simulador cuando una partícula
+    # diverge
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(text)
+
+@dataclass
+class Frame:
+    """
+    Un paso guardado. Los valores de cada partícula son arrays, en el orden en que se escribieron las partículas. Los
+    nombres se guardan como códigos en categories, que comparten todos los fotogramas del mismo archivo.
+    """
+    step: int
+    time: float
+    ids: np.ndarray
+    name_codes: np.ndarray
+    categories: list[str]
+    mass: np.ndarray
+    radius: np.ndarray
+    x: np.ndarray
+    y: np.ndarray
+    vx: np.ndarray
+    vy: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def names(self) -> np.ndarray:
+        return np.array(self.categories, dtype=object)[self.name_codes]
+
+    def name_contains(self, text: str) -> np.ndarray:
+        """Máscara booleana de las partículas cuyo nombre contiene text, por ejemplo frame.name_contains("Left")."""
+        matches = np.array([text in category for category in self.categories], dtype=bool)
+        return matches[self.name_codes] if len(matches) != 0 else np.zeros(len(self), dtype=bool)
+
+def _parse_frame(line: str, categories: list[str], category_codes: dict[str, int]) -> Frame:
+    # Una línea de fotograma es "{step} ; {partícula} ; {partícula} ; ...", así que cambiando los separadores por comas
+    # y agregando corchetes queda un array JSON que se decodifica de una sola vez
+    step_info, *particles = _loads('[' + line.replace(' ; ', ', ') + ']')
+
+    codes = np.empty(len(particles), dtype=np.int16)
+    for i, p in enumerate(particles):
+        code = category_codes.get(p['name'])
+        if code is None:
+            code = category_codes[p['name']] = len(categories)
+            categories.append(p['name'])
+        codes[i] = code
+
+    def column(key, dtype=np.float64):
+        return np.fromiter((p[key] for p in particles), dtype=dtype, count=len(particles))
+
+    return Frame(
+        step=step_info['step'],
+        time=step_info['time'],
+        ids=column('id', np.int64),
+        name_codes=codes,
+        categories=categories,
+        mass=column('mass'),
+        radius=column('radius'),
+        x=column('x'),
+        y=column('y'),
+        vx=column('vx'),
+        vy=column('vy'),
+    )
+
+def iter_frames(file_path: str, categories: list[str] | None = None) -> Iterator[Frame]:
+    """
+    Lee los fotogramas de una salida de la simulación de a una línea, sin guardar los anteriores. Una última línea
+    cortada por una corrida interrumpida se saltea. Los nombres de partícula nuevos se agregan a categories.
+    """
+    if categories is None:
+        categories = []
+    category_codes = {name: code for code, name in enumerate(categories)}
+
+    with open(file_path, 'r') as file:
+        for line in file:
+            if not line.startswith('{"step"') or not line.endswith('\n'):
+                continue
+            yield _parse_frame(line.rstrip('\n'), categories, category_codes)
+
+def index_frames(file_path: str, with_particles: bool = False) -> tuple[np.ndarray, np.ndarray]:
+    """
+    El offset en bytes y el tiempo de cada línea de fotograma completa de una salida de la simulación, decodificando
+    solo la información del paso de cada línea, para después poder leer cualquier fotograma con un seek. Con
+    with_particles=True se dejan afuera los fotogramas sin partículas.
+    """
+    offsets = []
+    times = []
+    offset = 0
+    with open(file_path, 'rb') as file:
+        for line in file:
+            if line.startswith(b'{"step"') and line.endswith(b'\n') and (not with_particles or b' ; ' in line):
+                offsets.append(offset)
+                times.append(_loads(line.split(b' ; ', 1)[0].rstrip(b'\n').decode())['time'])
+            offset += len(line)
+    return np.array(offsets, dtype=np.int64), np.array(times, dtype=np.float64)
+
+def read_frames_at(file_path: str, offsets: np.ndarray, categories: list[str] | None = None) -> list[Frame]:
+    """Decodifica solo los fotogramas cuyas líneas empiezan en offsets, como los devuelve index_frames."""
+    if categories is None:
+        categories = []
+    category_codes = {name: code for code, name in enumerate(categories)}
+
+    frames = []
+    with open(file_path, 'rb') as file:
+        for offset in offsets:
+            file.seek(offset)
+            frames.append(_parse_frame(file.readline().decode().rstrip('\n'), categories, category_codes))
+    return frames
+
+@dataclass
+class SimulationOutput:
+    integration_type: str | None
+    delta_time: float | None
+    categories: list[str] = field(default_factory=list)
+    frames: list[Frame] = field(default_factory=list)
+
+    @property
+    def times(self) -> np.ndarray:
+        return np.array([frame.time for frame in self.frames], dtype=np.float64)
+
+def parse_output(file_path: str) -> SimulationOutput:
+    """Los fotogramas de una salida de la simulación, con el tipo de integración y el delta time del encabezado."""
+    integration_type = delta_time = None
+    with open(file_path, 'r') as file:
+        first_line = file.readline()
+    if first_line.startswith('{"integrationType"'):
+        header = _loads(first_line)
+        integration_type = header['integrationType']
+        delta_time = header['deltaTime']
+
+    output = SimulationOutput(integration_type, delta_time)
+    output.frames = list(iter_frames(file_path, output.categories))
+    return output
+
+def _find_last_line(file_path: str, predicate, chunk_size: int = 1 << 16) -> bytes | None:
+    # Lee el archivo de atrás para adelante en bloques y devuelve la última línea completa (que termina en un salto de
+    # línea) que acepta predicate, así que solo se lee el final del archivo
+    with open(file_path, 'rb') as file:
+        position = file.seek(0, os.SEEK_END)
+        pending = b''
+        skip_tail = True
+        while position > 0:
+            size = min(chunk_size, position)
+            position -= size
+            file.seek(position)
+            lines = (file.read(size) + pending).split(b'\n')
+
+            # El primer pedazo puede seguir en el bloque anterior, y el que queda después del último salto de línea del
+            # archivo (una escritura interrumpida, o vacío) no es una línea completa
+            pending = lines[0] if position > 0 else b''
+            complete = lines[1:] if position > 0 else lines
+            if skip_tail and complete:
+                complete.pop()
+                skip_tail = False
+            for line in reversed(complete):
+                if predicate(line):
+                    return line
+            chunk_size *= 2
+    return None
+
+def read_last_frame(file_path: str, with_particles: bool = False) -> Frame | None:
+    """
+    Decodifica solo el último fotograma de una salida de la simulación, buscándolo hacia atrás desde el final del
+    archivo. Con with_particles=True se saltean los últimos fotogramas sin partículas.
+    """
+    def is_wanted(line: bytes) -> bool:
+        return line.startswith(b'{"step"') and (not with_particles or b' ; ' in line)
+
+    line = _find_last_line(file_path, is_wanted)
+    return _parse_frame(line.decode(), [], {}) if line is not None else None
+
+def read_final_time(file_path: str) -> float | None:
+    """El tiempo del último fotograma de una salida de la simulación, decodificando solo la información de su paso."""
+    line = _find_last_line(file_path, lambda line: line.startswith(b'{"step"'))
+    return _loads(line.split(b' ; ', 1)[0].decode())['time'] if line is not None else None
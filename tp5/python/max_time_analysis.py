@@ -1,6 +1,6 @@
 import os
-import json
 import glob
+from file_loader import read_final_time
 
 # Directorio de salida
 output_dir = "../bin/Debug/net8.0"
@@ -13,19 +13,9 @@ max_time = 0
 max_time_file = None
 
 for file_path in file_paths:
-    last_time = None
-    
     try:
-        with open(file_path, 'r') as f:
-            for line in f:
-                if "step" not in line:
-                    continue
-                try:
-                    time_info = json.loads(line.strip().split(" ; ")[0])
-                    last_time = time_info["time"]
-                except (json.JSONDecodeError, IndexError, KeyError):
-                    continue
-        
+        last_time = read_final_time(file_path)
+
         if last_time is not None and last_time > max_time:
             max_time = last_time
             max_time_file = file_path
@@ -0,0 +1,101 @@
+import copy
+
+import numpy as np
+
+from file_loader import Frame, iter_frames, read_final_time, read_last_frame
+from tracks import build_tracks
+from velocity import window_abs_vx
+
+class Reducer:
+    """
+    Un observable calculado a partir de los fotogramas de una corrida. reduce_run le pasa cada fotograma a add_frame
+    en una sola pasada compartida por todos los reducers, y después junta result(), un dict con sus columnas.
+
+    Los reducers que solo necesitan el final del archivo pueden implementar también from_tail(path); si todos los
+    reducers de una corrida lo hacen, reduce_run no recorre el archivo.
+    """
+    def add_frame(self, frame: Frame) -> None:
+        raise NotImplementedError
+
+    def result(self) -> dict:
+        raise NotImplementedError
+
+    def from_tail(self, path: str) -> dict:
+        raise NotImplementedError
+
+class Blocked(Reducer):
+    """blocked: si el último fotograma con partículas todavía tiene más de min_particles."""
+    def __init__(self, min_particles: int = 2):
+        self.min_particles = min_particles
+        self._last_particles = 0
+
+    def add_frame(self, frame):
+        if len(frame) != 0:
+            self._last_particles = len(frame)
+
+    def result(self):
+        return {'blocked': self._last_particles > self.min_particles}
+
+    def from_tail(self, path):
+        last_frame = read_last_frame(path, with_particles=True)
+        return {'blocked': last_frame is not None and len(last_frame) > self.min_particles}
+
+class FinalTime(Reducer):
+    """t_f: el tiempo del último fotograma."""
+    def __init__(self):
+        self._time = None
+
+    def add_frame(self, frame):
+        self._time = frame.time
+
+    def result(self):
+        return {'t_f': self._time}
+
+    def from_tail(self, path):
+        return {'t_f': read_final_time(path)}
+
+class MeanAbsVx(Reducer):
+    """mean_abs_vx: el promedio en el tiempo, sobre los fotogramas en [t1, t2], del |vx| medio de cada fotograma."""
+    def __init__(self, t1: float = 10.0, t2: float = 40.0):
+        self.t1 = t1
+        self.t2 = t2
+        self._sum = 0.0
+        self._count = 0
+
+    def add_frame(self, frame):
+        if self.t1 <= frame.time <= self.t2 and len(frame) != 0:
+            self._sum += np.abs(frame.vx).mean()
+            self._count += 1
+
+    def result(self):
+        return {'mean_abs_vx': self._sum / self._count if self._count != 0 else np.nan}
+
+class VxCurve(Reducer):
+    """vx_curve: (centros de las ventanas, <|vx|>) por ventana de largo window, calculado con velocity.window_abs_vx."""
+    def __init__(self, window: float = 1.0, interpolate: bool = False):
+        self.window = window
+        self.interpolate = interpolate
+        self._frames = []
+
+    def add_frame(self, frame):
+        self._frames.append(frame)
+
+    def result(self):
+        return {'vx_curve': window_abs_vx(build_tracks(self._frames), self.window, self.interpolate)}
+
+def _has_tail(reducer: Reducer) -> bool:
+    return type(reducer).from_tail is not Reducer.from_tail
+
+def reduce_run(path: str, reducers: list[Reducer]) -> dict:
+    """
+    Calcula todos los reducers sobre la corrida de path, leyendo el archivo una sola vez, y devuelve todas sus
+    columnas en un dict. Los reducers se copian, así que la misma lista sirve para muchas corridas.
+    """
+    reducers = copy.deepcopy(reducers)
+    if all(_has_tail(reducer) for reducer in reducers):
+        return {key: value for reducer in reducers for key, value in reducer.from_tail(path).items()}
+
+    for frame in iter_frames(path):
+        for reducer in reducers:
+            reducer.add_frame(frame)
+    return {key: value for reducer in reducers for key, value in reducer.result().items()}
@@ -0,0 +1,36 @@
+# Copia de tp4/python/renderer.py con los comentarios en español (tp3-gpu/python/renderer.py es la misma clase con
+# los nombres en español): los cambios se hacen en las tres.
+
+import numpy as np
+from matplotlib.collections import EllipseCollection
+
+class ParticleRenderer:
+    """
+    Dibuja todas las partículas con un único EllipseCollection en lugar de un Circle por partícula. Los radios están
+    en unidades de los datos, y cada fotograma solo cambia las posiciones con set_offsets, así que el blit redibuja un
+    solo artista. Con linewidth mayor a 0 cada partícula tiene un borde de ese ancho (en puntos) de su mismo color,
+    como un Circle creado con color=.
+    """
+    def __init__(self, ax, radii, colors='blue', alpha: float = 1.0, linewidth: float = 0, zorder: int = 2):
+        radii = np.atleast_1d(np.asarray(radii, dtype=float))
+        self.collection = EllipseCollection(
+            widths=2 * radii, heights=2 * radii, angles=0, units='xy',
+            offsets=np.zeros((len(radii), 2)), offset_transform=ax.transData,
+            facecolors=colors, edgecolors='face' if linewidth > 0 else 'none', linewidths=linewidth, alpha=alpha, zorder=zorder,
+        )
+        ax.add_collection(self.collection)
+
+    def update(self, positions: np.ndarray, colors=None, radii=None) -> list:
+        """
+        Mueve las partículas a positions, un array (N, 2) (las columnas de más se ignoran). N puede cambiar entre
+        fotogramas; en ese caso hay que pasar colors y radii por partícula si no son todos iguales. Devuelve la lista
+        de artistas para el blit.
+        """
+        self.collection.set_offsets(np.asarray(positions)[:, 0:2])
+        if colors is not None:
+            self.collection.set_facecolor(colors)
+        if radii is not None:
+            radii = np.atleast_1d(np.asarray(radii, dtype=float))
+            self.collection.set_widths(2 * radii)
+            self.collection.set_heights(2 * radii)
+        return [self.collection]
@@ -0,0 +1,178 @@
+import os
+from dataclasses import dataclass
+
+import numpy as np
+
+from file_loader import iter_frames
+
+@dataclass
+class Tracks:
+    """
+    La trayectoria de cada partícula de una corrida. Las muestras son arrays planos ordenados por id de partícula y
+    después por tiempo, y las de la i-ésima partícula (ids[i]) son las de [offsets[i], offsets[i + 1]), así que
+    track(i) es un slice. start_time y end_time son los tiempos del primer y el último fotograma, que pueden no tener
+    partículas.
+    """
+    start_time: float
+    end_time: float
+    ids: np.ndarray
+    offsets: np.ndarray
+    name_codes: np.ndarray
+    categories: list[str]
+    time: np.ndarray
+    x: np.ndarray
+    y: np.ndarray
+    vx: np.ndarray
+    vy: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    @property
+    def sample_track(self) -> np.ndarray:
+        """El índice de trayectoria de cada muestra."""
+        return np.repeat(np.arange(len(self)), self.lengths)
+
+    def index_of(self, particle_id: int) -> int:
+        index = int(np.searchsorted(self.ids, particle_id))
+        if index == len(self.ids) or self.ids[index] != particle_id:
+            raise KeyError(f"No hay ninguna partícula con id {particle_id}")
+        return index
+
+    def track(self, index: int) -> slice:
+        return slice(int(self.offsets[index]), int(self.offsets[index + 1]))
+
+    def track_of(self, particle_id: int) -> slice:
+        """El slice de las muestras de una partícula, por ejemplo tracks.x[tracks.track_of(42)]."""
+        return self.track(self.index_of(particle_id))
+
+    @property
+    def entry_times(self) -> np.ndarray:
+        return self.time[self.offsets[:-1]]
+
+    @property
+    def exit_times(self) -> np.ndarray:
+        return self.time[self.offsets[1:] - 1]
+
+    @property
+    def transit_durations(self) -> np.ndarray:
+        return self.exit_times - self.entry_times
+
+    @property
+    def mean_vx(self) -> np.ndarray:
+        """El desplazamiento en x entre la primera y la última muestra de cada partícula sobre su tiempo de tránsito."""
+        dx = self.x[self.offsets[1:] - 1] - self.x[self.offsets[:-1]]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return dx / self.transit_durations
+
+def build_tracks(frames) -> Tracks:
+    """Arma las trayectorias a partir de un iterable de fotogramas, como iter_frames(file_path)."""
+    ids, names, time, x, y, vx, vy = [], [], [], [], [], [], []
+    categories = []
+    start_time = end_time = 0.0
+    for i, frame in enumerate(frames):
+        if i == 0:
+            start_time = frame.time
+        end_time = frame.time
+        categories = frame.categories
+        ids.append(frame.ids)
+        names.append(frame.name_codes)
+        time.append(np.full(len(frame), frame.time))
+        x.append(frame.x)
+        y.append(frame.y)
+        vx.append(frame.vx)
+        vy.append(frame.vy)
+
+    if sum(len(frame_ids) for frame_ids in ids) == 0:
+        empty = np.zeros(0)
+        return Tracks(start_time, end_time, np.zeros(0, dtype=np.int64), np.zeros(1, dtype=np.int64),
+                      np.zeros(0, dtype=np.int16), list(categories), empty, empty, empty, empty, empty)
+
+    ids = np.concatenate(ids)
+    time = np.concatenate(time)
+    order = np.lexsort((time, ids))
+    ids = ids[order]
+
+    starts = np.flatnonzero(np.concatenate([[True], ids[1:] != ids[:-1]]))
+    return Tracks(
+        start_time=start_time,
+        end_time=end_time,
+        ids=ids[starts],
+        offsets=np.append(starts, len(ids)),
+        name_codes=np.concatenate(names)[order][starts],
+        categories=list(categories),
+        time=time[order],
+        x=np.concatenate(x)[order],
+        y=np.concatenate(y)[order],
+        vx=np.concatenate(vx)[order],
+        vy=np.concatenate(vy)[order],
+    )
+
+def _cache_path(file_path: str) -> str:
+    return file_path + '.tracks.npz'
+
+def _source_key(file_path: str) -> np.ndarray:
+    stat = os.stat(file_path)
+    return np.array([stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+
+def _read_cache(file_path: str) -> Tracks | None:
+    cache_path = _cache_path(file_path)
+    if not os.path.exists(cache_path):
+        return None
+
+    with np.load(cache_path) as cache:
+        if not np.array_equal(cache['source_key'], _source_key(file_path)):
+            return None
+        return Tracks(
+            start_time=float(cache['start_time']),
+            end_time=float(cache['end_time']),
+            ids=cache['ids'],
+            offsets=cache['offsets'],
+            name_codes=cache['name_codes'],
+            categories=[str(name) for name in cache['categories']],
+            time=cache['time'],
+            x=cache['x'],
+            y=cache['y'],
+            vx=cache['vx'],
+            vy=cache['vy'],
+        )
+
+def _write_cache(file_path: str, tracks: Tracks, source_key: np.ndarray) -> None:
+    try:
+        np.savez(
+            _cache_path(file_path),
+            source_key=source_key,
+            start_time=tracks.start_time,
+            end_time=tracks.end_time,
+            ids=tracks.ids,
+            offsets=tracks.offsets,
+            name_codes=tracks.name_codes,
+            categories=np.array(tracks.categories, dtype=str),
+            time=tracks.time,
+            x=tracks.x,
+            y=tracks.y,
+            vx=tracks.vx,
+            vy=tracks.vy,
+        )
+    except OSError as e:
+        print(f"No se pudieron guardar las trayectorias de {file_path}: {e}")
+
+def load_tracks(file_path: str, use_cache: bool = True) -> Tracks:
+    """
+    Las trayectorias de una salida de la simulación. Se guardan junto al archivo (.tracks.npz) y se reusan mientras
+    no cambien su tamaño ni su fecha de modificación.
+    """
+    if use_cache:
+        cached = _read_cache(file_path)
+        if cached is not None:
+            return cached
+
+    source_key = _source_key(file_path)
+    tracks = build_tracks(iter_frames(file_path))
+    if use_cache:
+        _write_cache(file_path, tracks, source_key)
+    return tracks
@@ -1,8 +1,8 @@
-import json
 import os
 import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
+from file_loader import parse_output
 
 # Archivo por valor de Qin (renombrar según corresponda)
 qin_files = {
@@ -21,56 +21,19 @@ qin_vals = []
 mean_vx_vals = []
 error_vx_vals = []
 
-def parse_output_file(filepath):
-    with open(filepath, 'r') as f:
-        lines = f.readlines()
-
-    frames = []
-    current_frame = None
-
-    for line in lines:
-        line = line.strip()
-        if line.startswith("{\"step\""):
-            if current_frame is not None and "particles" in current_frame:
-                frames.append(current_frame)
-            parts = line.split(" ; ")
-            step_info = json.loads(parts[0])
-            current_frame = {"step": step_info["step"], "time": step_info["time"], "particles": []}
-            if len(parts) > 1:
-                try:
-                    current_frame["particles"].append(json.loads(parts[1]))
-                except json.JSONDecodeError:
-                    pass
-        elif current_frame is not None:
-            try:
-                current_frame["particles"].append(json.loads(line))
-            except json.JSONDecodeError:
-                continue
-
-    if current_frame is not None and "particles" in current_frame:
-        frames.append(current_frame)
-
-    return frames
-
 for qin, filename in qin_files.items():
     if not os.path.exists(filename):
         print(f"Archivo no encontrado para Qin = {qin}: {filename}")
         continue
 
-    frames = parse_output_file(filename)
+    frames = parse_output(filename).frames
     if not frames:
         continue
 
-    t_max = max(f["time"] for f in frames)
+    t_max = max(f.time for f in frames)
     t2 = min(t2_max, t_max)
 
-    vx_t = []
-    for frame in frames:
-        t = frame["time"]
-        if t1 <= t <= t2 and frame["particles"]:
-            vx_vals = [abs(p["vx"]) for p in frame["particles"]]
-            avg_vx = sum(vx_vals) / len(vx_vals)
-            vx_t.append(avg_vx)
+    vx_t = [np.abs(frame.vx).mean() for frame in frames if t1 <= frame.time <= t2 and len(frame) != 0]
 
     if vx_t:
         mean_vx = np.mean(vx_t)
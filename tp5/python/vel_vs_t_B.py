@@ -1,8 +1,8 @@
-import json
 import pandas as pd
 import matplotlib.pyplot as plt
-from collections import defaultdict
 import os
+from tracks import load_tracks
+from velocity import window_abs_vx
 
 # Lista de valores de B
 B_values = [ 0.02, 0.08, 0.10]
@@ -18,70 +18,11 @@ for B in B_values:
         print(f"Archivo no encontrado para B = {B}: {file_path}")
         continue
 
-    # Leer líneas del archivo
-    with open(file_path, 'r') as f:
-        lines = f.readlines()
-
-    # Parsear datos por frame
-    frames = []
-    current_frame = None
-    for line in lines:
-        line = line.strip()
-        if line.startswith("{\"step\""):
-            if current_frame and "particles" in current_frame:
-                frames.append(current_frame)
-            parts = line.split(" ; ")
-            step_info = json.loads(parts[0])
-            current_frame = {"time": step_info["time"], "particles": []}
-            if len(parts) > 1:
-                try:
-                    current_frame["particles"].append(json.loads(parts[1]))
-                except json.JSONDecodeError:
-                    pass
-        elif current_frame:
-            try:
-                current_frame["particles"].append(json.loads(line))
-            except json.JSONDecodeError:
-                continue
-    if current_frame and "particles" in current_frame:
-        frames.append(current_frame)
-
-    # Historial de posiciones por partícula
-    particle_history = defaultdict(list)
-    for frame in frames:
-        t = frame["time"]
-        for p in frame["particles"]:
-            particle_history[p["id"]].append((t, p["x"]))
+    tracks = load_tracks(file_path)
 
     # Calcular <|vx|> en bloques de 1 segundo
-    start_time = min(frame["time"] for frame in frames)
-    end_time = max(frame["time"] for frame in frames)
     step_size = 1.0  # segundos
-
-    times = []
-    avg_abs_vx_per_second = []
-
-    t = start_time
-    while t + step_size <= end_time:
-        vx_list = []
-        for particle_id, history in particle_history.items():
-            x0 = x1 = None
-            for i in range(len(history) - 1):
-                if history[i][0] <= t < history[i+1][0]:
-                    x0 = history[i][1]
-                if history[i][0] <= t + step_size < history[i+1][0]:
-                    x1 = history[i][1]
-                    break
-            if x0 is not None and x1 is not None:
-                vx = (x1 - x0) / step_size
-                vx_list.append(abs(vx))
-
-        if vx_list:
-            avg_vx = sum(vx_list) / len(vx_list)
-            times.append(t + step_size / 2)
-            avg_abs_vx_per_second.append(avg_vx)
-
-        t += step_size
+    times, avg_abs_vx_per_second = window_abs_vx(tracks, step_size)
 
     df = pd.DataFrame({
         "time": times,
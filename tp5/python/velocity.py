@@ -0,0 +1,68 @@
+import numpy as np
+
+from tracks import Tracks
+
+def _last_sample_at_or_before(track, times, query_track, query_times) -> np.ndarray:
+    """
+    Para cada consulta (trayectoria, tiempo), el índice global de la última muestra de esa trayectoria con tiempo <= el
+    de la consulta, o uno menos que la primera muestra de la trayectoria si no hay ninguna. Las muestras tienen que
+    estar ordenadas por trayectoria y después por tiempo.
+
+    Ordenando juntas las muestras y las consultas por (trayectoria, tiempo), con las muestras antes que las consultas
+    en los empates, delante de cada consulta quedan justo las muestras lexicográficamente <= a ella, así que un solo
+    ordenamiento hace todas las búsquedas por trayectoria a la vez.
+    """
+    is_query = np.concatenate([np.zeros(len(times), dtype=bool), np.ones(len(query_times), dtype=bool)])
+    order = np.lexsort((
+        is_query,
+        np.concatenate([times, query_times]),
+        np.concatenate([track, query_track]),
+    ))
+    samples_before = np.cumsum(~is_query[order])
+    result = np.empty(len(query_times), dtype=np.int64)
+    result[order[is_query[order]] - len(times)] = samples_before[is_query[order]] - 1
+    return result
+
+def window_abs_vx(tracks: Tracks, window: float = 1.0, interpolate: bool = False) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Calcula <|vx|> en ventanas consecutivas [t, t + window) desde el primer fotograma, donde el vx de cada partícula
+    es (x(t + window) - x(t)) / window. Solo cuentan las partículas que tienen muestras a ambos lados de t y de
+    t + window.
+
+    Por defecto x(t) es la última muestra en t o antes, como hacían los scripts originales; con interpolate=True se
+    interpola linealmente entre las muestras alrededor de t. Devuelve (centros de las ventanas, <|vx|>), salteando
+    las ventanas en las que no cuenta ninguna partícula.
+    """
+    particles = len(tracks)
+    starts = tracks.start_time + window * np.arange(int(np.floor((tracks.end_time - tracks.start_time) / window)) + 1)
+    starts = starts[starts + window <= tracks.end_time]
+    if particles == 0 or len(starts) == 0:
+        return np.zeros(0), np.zeros(0)
+
+    times, x, offsets, lengths = tracks.time, tracks.x, tracks.offsets[:-1], tracks.lengths
+
+    # Una consulta por (partícula, borde de ventana): todos los comienzos de las ventanas y después todos los finales
+    edges = np.concatenate([starts, starts + window])
+    query_track = np.repeat(np.arange(particles), len(edges))
+    query_times = np.tile(edges, particles)
+
+    last = _last_sample_at_or_before(tracks.sample_track, times, query_track, query_times)
+    local = last - offsets[query_track]
+    valid = (local >= 0) & (local + 1 < lengths[query_track])
+
+    index = np.where(valid, last, 0)
+    positions = x[index]
+    if interpolate:
+        following = np.where(valid, last + 1, 0)
+        fraction = (query_times - times[index]) / np.where(valid, times[following] - times[index], 1.0)
+        positions = positions + (x[following] - positions) * fraction
+
+    positions = positions.reshape(particles, 2, len(starts))
+    valid = valid.reshape(particles, 2, len(starts))
+    counted = valid[:, 0] & valid[:, 1]
+    abs_vx = np.abs(positions[:, 1] - positions[:, 0]) / window
+
+    count = counted.sum(axis=0)
+    sums = np.where(counted, abs_vx, 0).sum(axis=0)
+    has_particles = count != 0
+    return starts[has_particles] + window / 2, sums[has_particles] / count[has_particles]
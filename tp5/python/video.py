@@ -0,0 +1,356 @@
+# Copia de tp4/python/video.py con los comentarios en español: los cambios se hacen en las dos.
+
+import os
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from typing import Callable
+
+import numpy as np
+from matplotlib.colors import to_rgb
+
+def rgb(color, alpha: float = 1.0, background='white') -> np.ndarray:
+    """Un color de matplotlib como RGB uint8, mezclado sobre background si alpha es menor a 1."""
+    blended = alpha * np.array(to_rgb(color)) + (1 - alpha) * np.array(to_rgb(background))
+    return np.round(255 * blended).astype(np.uint8)
+
+def _render(fig) -> np.ndarray:
+    fig.canvas.draw()
+    return np.asarray(fig.canvas.buffer_rgba())[..., :3].copy()
+
+@dataclass
+class Panel:
+    """
+    Dónde van en el fotograma las partículas de unos ejes: píxel (col, row) = posición * scale + offset, recortado a
+    la caja de los ejes (row0, row1, col0, col1), con cada partícula dibujada como los píxeles de stencil, offsets
+    (row, col) de un disco.
+    """
+    scale: np.ndarray
+    offset: np.ndarray
+    clip: tuple[int, int, int, int]
+    stencil: np.ndarray
+
+    @classmethod
+    def from_axes(cls, ax, radius: float, height: int) -> 'Panel':
+        """Toma la transformación de los límites actuales de los ejes; solo sirve para ejes lineales."""
+        origin, unit = ax.transData.transform([[0.0, 0.0], [1.0, 1.0]])
+        scale = np.array([unit[0] - origin[0], origin[1] - unit[1]])
+        offset = np.array([origin[0], height - origin[1]])
+
+        x0, y0, x1, y1 = ax.bbox.extents
+        clip = (max(int(np.floor(height - y1)), 0), int(np.ceil(height - y0)), max(int(np.floor(x0)), 0), int(np.ceil(x1)))
+
+        radius_cols = max(abs(radius * scale[0]), 0.5)
+        radius_rows = max(abs(radius * scale[1]), 0.5)
+        rows, cols = np.meshgrid(
+            np.arange(-np.ceil(radius_rows), np.ceil(radius_rows) + 1),
+            np.arange(-np.ceil(radius_cols), np.ceil(radius_cols) + 1),
+            indexing='ij',
+        )
+        inside = (cols / radius_cols) ** 2 + (rows / radius_rows) ** 2 <= 1
+        stencil = np.column_stack([rows[inside], cols[inside]]).astype(np.int64)
+        return cls(scale=scale, offset=offset, clip=clip, stencil=stencil)
+
+    def splat(self, buffer: np.ndarray, positions: np.ndarray, colors: np.ndarray) -> None:
+        """Dibuja un disco del color correspondiente (un array uint8 (N, 3)) en cada una de las posiciones (N, 2)."""
+        centers = np.floor(positions[:, 0:2] * self.scale + self.offset).astype(np.int64)
+        rows = centers[:, 1, None] + self.stencil[None, :, 0]
+        cols = centers[:, 0, None] + self.stencil[None, :, 1]
+        row0, row1, col0, col1 = self.clip
+        row1, col1 = min(row1, buffer.shape[0]), min(col1, buffer.shape[1])
+        inside = (rows >= row0) & (rows < row1) & (cols >= col0) & (cols < col1)
+        particle = np.broadcast_to(np.arange(len(centers))[:, None], rows.shape)
+        buffer[rows[inside], cols[inside]] = colors[particle[inside]]
+
+    def shifted(self, row0: int, col0: int) -> 'Panel':
+        """El mismo panel en un fotograma recortado para empezar en (row0, col0)."""
+        row_start, row_stop, col_start, col_stop = self.clip
+        clip = (max(row_start - row0, 0), row_stop - row0, max(col_start - col0, 0), col_stop - col0)
+        return replace(self, offset=self.offset - [col0, row0], clip=clip)
+
+@dataclass
+class PackedFrames:
+    """
+    Las partículas de un panel en todos los fotogramas, empaquetadas: el fotograma i es
+    positions/colors[offsets[i]:offsets[i + 1]].
+    """
+    offsets: np.ndarray
+    positions: np.ndarray
+    colors: np.ndarray
+
+    @classmethod
+    def from_state(cls, state: np.ndarray, color: np.ndarray) -> 'PackedFrames':
+        """A partir de un array de estado (T, N, >=2) donde todas las partículas tienen el mismo color."""
+        frames, particles = state.shape[0], state.shape[1]
+        positions = np.ascontiguousarray(state[:, :, 0:2], dtype=np.float32).reshape(-1, 2)
+        return cls(
+            offsets=np.arange(frames + 1) * particles,
+            positions=positions,
+            colors=np.broadcast_to(np.asarray(color, dtype=np.uint8), (len(positions), 3)).copy(),
+        )
+
+    @classmethod
+    def from_frames(cls, frames: list[tuple[np.ndarray, np.ndarray]]) -> 'PackedFrames':
+        """A partir de una lista de pares (posiciones (N, 2), colores (N, 3)); N puede cambiar entre fotogramas."""
+        lengths = [len(positions) for positions, _ in frames]
+        return cls(
+            offsets=np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64),
+            positions=np.concatenate([positions for positions, _ in frames]).astype(np.float32).reshape(-1, 2),
+            colors=np.concatenate([colors for _, colors in frames]).astype(np.uint8).reshape(-1, 3),
+        )
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> tuple[np.ndarray, np.ndarray]:
+        start, stop = self.offsets[index], self.offsets[index + 1]
+        return self.positions[start:stop], self.colors[start:stop]
+
+    def subset(self, start: int, stop: int) -> 'PackedFrames':
+        first, last = self.offsets[start], self.offsets[stop]
+        return PackedFrames(
+            offsets=self.offsets[start:stop + 1] - first,
+            positions=self.positions[first:last],
+            colors=self.colors[first:last],
+        )
+
+    def packed(self) -> 'PackedFrames':
+        return self
+
+@dataclass
+class LazyFrames:
+    """
+    Los fotogramas [start, stop) de una fuente que solo se cargan al renderizarlos: load(start, stop) devuelve sus
+    PackedFrames. load se manda a los procesos, así que tiene que poder serializarse con pickle (una función del
+    módulo o un functools.partial de una), y cada proceso carga solo el bloque que está codificando.
+    """
+    load: Callable[[int, int], PackedFrames]
+    start: int
+    stop: int
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def subset(self, start: int, stop: int) -> 'LazyFrames':
+        return replace(self, start=self.start + start, stop=self.start + stop)
+
+    def packed(self) -> PackedFrames:
+        return self.load(self.start, self.stop)
+
+@dataclass
+class TextSpec:
+    """
+    Un texto de la figura que muestra prefix + un valor formateado + suffix en cada fotograma. values tiene el valor
+    de cada fotograma, y width es la cantidad de caracteres reservados para él.
+    """
+    artist: object
+    prefix: str
+    suffix: str
+    fmt: str
+    values: np.ndarray
+    width: int | None = None
+
+    def formatted(self, value) -> str:
+        return self.fmt.format(value)
+
+@dataclass
+class TextStrip:
+    """
+    Un texto monoespaciado cuyos caracteres variables se copian de tiras prerenderizadas en lugar de dibujarse.
+    glyphs[c] es la región del texto renderizada con c en todas las celdas variables, y cells[i] las columnas de la
+    celda variable i.
+    """
+    fmt: str
+    width: int
+    region: tuple[int, int, int, int]
+    cells: np.ndarray
+    glyphs: dict[str, np.ndarray]
+    values: np.ndarray
+
+    def stamp(self, buffer: np.ndarray, value) -> None:
+        row0, row1, _, _ = self.region
+        text = self.fmt.format(value).rjust(self.width)[:self.width]
+        for (col0, col1), char in zip(self.cells, text):
+            glyph = self.glyphs.get(char)
+            if glyph is not None:
+                buffer[row0:row1, col0:col1] = glyph[:, col0 - self.region[2]:col1 - self.region[2]]
+
+    def subset(self, start: int, stop: int) -> 'TextStrip':
+        return replace(self, values=self.values[start:stop])
+
+    def shifted(self, row0: int, col0: int) -> 'TextStrip':
+        """El mismo texto en un fotograma recortado para empezar en (row0, col0); el texto tiene que quedar adentro."""
+        row_start, row_stop, col_start, col_stop = self.region
+        return replace(self, region=(row_start - row0, row_stop - row0, col_start - col0, col_stop - col0), cells=self.cells - col0)
+
+def _text_strips(fig, texts: list[TextSpec], charset: str) -> tuple[np.ndarray, list[TextStrip]]:
+    widths = []
+    for spec in texts:
+        spec.artist.set_fontfamily('monospace')
+        widths.append(spec.width or max(len(spec.formatted(value)) for value in spec.values))
+
+    def show(char):
+        for spec, width in zip(texts, widths):
+            spec.artist.set_text(spec.prefix + char * width + spec.suffix)
+
+    # El fondo tiene espacios donde van los valores; después un render por carácter llena todos los espacios con él
+    show(' ')
+    background = _render(fig)
+    height = background.shape[0]
+    renderer = fig.canvas.get_renderer()
+
+    layouts = []
+    for spec, width in zip(texts, widths):
+        x0, y0, x1, y1 = spec.artist.get_window_extent(renderer).extents
+        advance = (x1 - x0) / (len(spec.prefix) + width + len(spec.suffix))
+        starts = x0 + advance * (len(spec.prefix) + np.arange(width + 1))
+        bounds = np.clip(np.round(starts).astype(np.int64), 0, background.shape[1])
+        cells = np.column_stack([bounds[:-1], bounds[1:]])
+        region = (
+            max(int(np.floor(height - y1)), 0), min(int(np.ceil(height - y0)), height),
+            int(bounds[0]), int(bounds[-1]),
+        )
+        layouts.append((region, cells))
+
+    glyphs = [{} for _ in texts]
+    for char in charset:
+        show(char)
+        image = _render(fig)
+        for strip_glyphs, ((row0, row1, col0, col1), _) in zip(glyphs, layouts):
+            strip_glyphs[char] = image[row0:row1, col0:col1].copy()
+    show(' ')
+
+    strips = [
+        TextStrip(spec.fmt, width, region, cells, strip_glyphs, np.asarray(spec.values))
+        for spec, width, (region, cells), strip_glyphs in zip(texts, widths, layouts, glyphs)
+    ]
+    return background, strips
+
+@dataclass
+class Scene:
+    """
+    Todo lo necesario para rasterizar los fotogramas de un video sin matplotlib: un fondo prerenderizado, los paneles
+    donde se dibujan las partículas, sus posiciones por fotograma (empaquetadas, o cargadas a demanda) y los textos
+    que cambian en cada fotograma. Solo tiene arrays y funciones serializables, así que se puede mandar a procesos.
+    """
+    background: np.ndarray
+    panels: list[Panel]
+    frames: list[PackedFrames | LazyFrames]
+    texts: list[TextStrip]
+
+    @classmethod
+    def from_figure(cls, fig, panels: list[tuple[object, float, PackedFrames | LazyFrames]],
+                    texts: list[TextSpec] = (), charset: str = '0123456789.-') -> 'Scene':
+        """
+        Renderiza fig una vez como fondo, así que ya tiene que tener sus ejes, límites y artistas fijos pero no las
+        partículas. panels tiene (ejes, radio de las partículas, fotogramas) y texts los textos que muestran un valor
+        por fotograma; se les cambia la fuente a una monoespaciada.
+        """
+        background, strips = _text_strips(fig, list(texts), charset)
+        # Dimensiones pares, como necesita yuv420p
+        background = background[:background.shape[0] // 2 * 2, :background.shape[1] // 2 * 2]
+        height = background.shape[0]
+        return cls(
+            background=np.ascontiguousarray(background),
+            panels=[Panel.from_axes(ax, radius, height) for ax, radius, _ in panels],
+            frames=[frames for _, _, frames in panels],
+            texts=strips,
+        )
+
+    def __len__(self) -> int:
+        return len(self.frames[0]) if self.frames else len(self.texts[0].values)
+
+    def render(self, index: int, buffer: np.ndarray) -> None:
+        """Dibuja el fotograma index en buffer; los fotogramas de la escena tienen que estar empaquetados."""
+        np.copyto(buffer, self.background)
+        for panel, frames in zip(self.panels, self.frames):
+            panel.splat(buffer, *frames[index])
+        for text in self.texts:
+            text.stamp(buffer, text.values[index])
+
+    def subset(self, start: int, stop: int) -> 'Scene':
+        return replace(
+            self,
+            frames=[frames.subset(start, stop) for frames in self.frames],
+            texts=[text.subset(start, stop) for text in self.texts],
+        )
+
+    def packed(self) -> 'Scene':
+        """La escena con los fotogramas de cada panel cargados, lista para renderizar."""
+        return replace(self, frames=[frames.packed() for frames in self.frames])
+
+    def crop(self, region: tuple[int, int, int, int]) -> 'Scene':
+        """La escena restringida a los píxeles de region (row0, row1, col0, col1), que tiene que contener sus textos."""
+        row0, row1, col0, col1 = region
+        return replace(
+            self,
+            background=np.ascontiguousarray(self.background[row0:row1, col0:col1]),
+            panels=[panel.shifted(row0, col0) for panel in self.panels],
+            texts=[text.shifted(row0, col0) for text in self.texts],
+        )
+
+@contextmanager
+def ffmpeg_pipe(output_path: str, width: int, height: int, fps: float, ffmpeg: str = 'ffmpeg'):
+    """Lanza ffmpeg codificando fotogramas rgb24 crudos de width x height desde su stdin, que es lo que devuelve."""
+    command = [
+        ffmpeg, '-y', '-loglevel', 'error',
+        '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-s', f'{width}x{height}', '-r', str(fps), '-i', '-',
+        '-c:v', 'libx264', '-pix_fmt', 'yuv420p', output_path,
+    ]
+    with subprocess.Popen(command, stdin=subprocess.PIPE) as process:
+        yield process.stdin
+        process.stdin.close()
+    if process.returncode != 0:
+        raise RuntimeError(f"ffmpeg terminó con código {process.returncode} al escribir {output_path}")
+
+def _encode(scene: Scene, output_path: str, fps: float, ffmpeg: str, chunk_size: int) -> str:
+    height, width, _ = scene.background.shape
+    buffer = np.empty_like(scene.background)
+    with ffmpeg_pipe(output_path, width, height, fps, ffmpeg) as stdin:
+        for start in range(0, len(scene), chunk_size):
+            chunk = scene.subset(start, min(start + chunk_size, len(scene))).packed()
+            for index in range(len(chunk)):
+                chunk.render(index, buffer)
+                stdin.write(buffer.data)
+    return output_path
+
+def export_video(scene: Scene, output_path: str, fps: float = 30, workers: int = 1, ffmpeg: str = 'ffmpeg',
+                 chunk_size: int = 256) -> None:
+    """
+    Escribe los fotogramas de la escena en output_path, pasándole a ffmpeg por stdin fotogramas RGB crudos dibujados
+    en un único buffer reusado. Con workers > 1 los fotogramas se dividen en esa cantidad de rangos contiguos, cada
+    proceso codifica uno en su propio segmento, y los segmentos se unen con el demuxer concat de ffmpeg sin
+    recodificar.
+
+    Los fotogramas se cargan de a chunk_size, así que con LazyFrames la memoria usada no crece con el largo del video.
+
+    Los scripts que usen workers tienen que llamarlo bajo if __name__ == "__main__", porque los procesos los importan.
+    """
+    workers = max(1, min(workers, len(scene)))
+    if workers == 1:
+        _encode(scene, output_path, fps, ffmpeg, chunk_size)
+        return
+
+    bounds = np.linspace(0, len(scene), workers + 1).astype(np.int64)
+    extension = os.path.splitext(output_path)[1] or '.mp4'
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(output_path))) as directory:
+        segments = [os.path.join(directory, f'segment-{k}{extension}') for k in range(workers)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(
+                _encode,
+                [scene.subset(start, stop) for start, stop in zip(bounds[:-1], bounds[1:])],
+                segments,
+                [fps] * workers,
+                [ffmpeg] * workers,
+                [chunk_size] * workers,
+            ))
+
+        list_path = os.path.join(directory, 'segments.txt')
+        with open(list_path, 'w') as file:
+            file.writelines(f"file '{segment}'\n" for segment in segments)
+        subprocess.run(
+            [ffmpeg, '-y', '-loglevel', 'error', '-f', 'concat', '-safe', '0', '-i', list_path, '-c', 'copy', output_path],
+            check=True,
+        )